@@ -111,10 +111,17 @@ ICONSET_MEMBERS: List[Tuple[str, int]] = [
 def main() -> None:
     os.makedirs(ICONS_DIR, exist_ok=True)
 
-    for size in PNG_SIZES:
-        icon = create_icon(size)
+    # Draw once at the largest size and downsample; Lanczos also gives the small
+    # sizes smoother edges than rasterizing the shapes directly at 16px.
+    master_size = max(PNG_SIZES)
+    master = create_icon(master_size)
+    for size in sorted(PNG_SIZES, reverse=True):
+        if size == master_size:
+            icon = master
+        else:
+            icon = master.resize((size, size), Image.Resampling.LANCZOS)
         out = os.path.join(ICONS_DIR, f"icon_{size}x{size}.png")
-        icon.save(out)
+        icon.save(out, optimize=True)
         print(f"Wrote {out}")
 
     if sys.platform != "darwin":
@@ -10,15 +10,16 @@ Version: 0.4.2
 """
 
 import os
+import re
 import sys
 import argparse
 import subprocess
 import tempfile
+import warnings
 import shutil
-import glob
+from functools import lru_cache
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
-import piexif
+from PIL import Image
 import platform
 from tqdm import tqdm
 
@@ -30,8 +31,12 @@ from .core import (
     format_datetime,
     get_system_font,
     parse_resolution,
+    _CONCAT_PATH_ESCAPES,
+    _escape_concat_metadata,
+    _ffmpeg_failure_message,
+    _read_image_size,
 )
-from .utils import get_ffmpeg_path
+from .utils import get_ffmpeg_path, detect_hw_encoder, hw_encoder_args
 
 __version__ = "0.4.2"
 __author__ = "Dave Klee"
@@ -48,36 +53,106 @@ __all__ = [
 ]
 
 
-def create_date_files(image_dir, output_dir):
-    """Create a list of image files with their dates.
+_IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".tiff", ".bmp"})
+
+
+def _is_image_entry(entry):
+    """Return True if a ``os.DirEntry`` is a visible image file."""
+    return (
+        not entry.name.startswith(".")
+        and os.path.splitext(entry.name)[1].lower() in _IMAGE_EXTENSIONS
+        and entry.is_file()
+    )
+
+
+def _list_images(image_dir):
+    """List the image files in a directory with a single ``os.scandir`` pass.
 
     Args:
-        image_dir (str): Directory containing source images
-        output_dir (str): Directory for output files
+        image_dir (str): Directory to scan
 
     Returns:
-        list: List of tuples (image_path, date_string)
+        list: Sorted image file paths (hidden files are skipped)
+    """
+    with os.scandir(image_dir) as it:
+        return sorted(entry.path for entry in it if _is_image_entry(entry))
 
-    The function:
-    1. Creates output directory if it doesn't exist
-    2. Finds all image files in input directory
-    3. Extracts date/time from each image
-    4. Returns sorted list of (image_path, date) tuples
+
+def _concat_entry(img_path, date_str, duration_line):
+    """Format one image's block for the ffmpeg concat demuxer list.
+
+    Args:
+        img_path (str): Path to the image file
+        date_str (str): Date to attach as packet metadata, or None
+        duration_line (str): Pre-formatted ``duration ...`` line
+
+    Returns:
+        str: The ``file``/``duration`` (and optional metadata) lines
     """
-    os.makedirs(output_dir, exist_ok=True)
-    image_files = []
-    for ext in ["*.jpg", "*.jpeg", "*.png", "*.tiff", "*.bmp"]:
-        image_files.extend(glob.glob(os.path.join(image_dir, ext)))
-        image_files.extend(glob.glob(os.path.join(image_dir, ext.upper())))
-    image_files.sort()
-    date_files = []
-    for img_path in image_files:
-        date_time = extract_date_time(img_path)
-        formatted_date = format_datetime(date_time)
-        date_files.append((img_path, formatted_date))
-    return date_files
+    # The list is read from stdin, so paths cannot be relative to it; the
+    # explicit file: protocol stops ffmpeg resolving them against "pipe:"
+    path = os.path.abspath(img_path).translate(_CONCAT_PATH_ESCAPES)
+    entry = f"file 'file:{path}'\n{duration_line}"
+    if date_str:
+        entry += f"file_packet_metadata date={_escape_concat_metadata(date_str)}\n"
+    return entry
+
+
+def _make_scratch_dir(fallback_parent):
+    """Create a scratch directory, preferring memory-backed /dev/shm.
+
+    Args:
+        fallback_parent (str): Parent directory to use when /dev/shm is
+            unavailable
+
+    Returns:
+        str: Path to the new directory
+    """
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        try:
+            return tempfile.mkdtemp(prefix="sisr_", dir="/dev/shm")
+        except OSError:
+            pass
+    return tempfile.mkdtemp(dir=fallback_parent)
+
+
+# Output size for each crop_type prefix ("hd_center" -> "hd")
+_CROP_TARGETS = {"hd": (1920, 1080), "uhd": (3840, 2160)}
+
 
+def _compute_scale_crop(orig_width, orig_height, target_width, target_height, keep):
+    """Work out the scale size and vertical crop offset for a fill-and-crop.
 
+    Args:
+        orig_width (int): Source image width
+        orig_height (int): Source image height
+        target_width (int): Output width
+        target_height (int): Output height
+        keep (str): Which part to keep vertically: "top", "bottom" or "center"
+
+    Returns:
+        tuple: (resize_width, resize_height, crop_y_offset)
+    """
+    orig_ratio = orig_width / orig_height
+    if orig_ratio > target_width / target_height:
+        # Image is wider than target, scale to height
+        resize_height = target_height
+        resize_width = round(orig_ratio * target_height)
+    else:
+        # Image is taller than target, scale to width
+        resize_width = target_width
+        resize_height = round(target_width / orig_ratio)
+
+    if keep == "top":
+        crop_y_offset = 0
+    elif keep == "bottom":
+        crop_y_offset = resize_height - target_height
+    else:
+        crop_y_offset = (resize_height - target_height) // 2
+    return resize_width, resize_height, crop_y_offset
+
+
+@lru_cache(maxsize=1)
 def get_system_font():
     """Get the appropriate system font for the current platform.
 
@@ -89,7 +164,8 @@ def get_system_font():
     - macOS: Checks several system font paths
     - Linux: Checks several common font paths
 
-    Falls back to 'Arial' if no system font is found.
+    Falls back to 'Arial' if no system font is found. The result is cached, so
+    the font paths are only probed once per process.
     """
     system = platform.system()
     if system == "Windows":
@@ -121,6 +197,10 @@ def get_system_font():
         return "Arial"
 
 
+_RESOLUTION_SEP = re.compile(r"[x:]")
+
+
+@lru_cache(maxsize=16)
 def parse_resolution(resolution_str):
     """Parse a resolution string into width and height.
 
@@ -140,11 +220,7 @@ def parse_resolution(resolution_str):
     """
     if not resolution_str:
         return None, None
-    parts = (
-        resolution_str.split("x")
-        if "x" in resolution_str
-        else resolution_str.split(":")
-    )
+    parts = _RESOLUTION_SEP.split(resolution_str, maxsplit=1)
     if len(parts) != 2:
         return None, None
     try:
@@ -160,6 +236,8 @@ def create_video_with_overlay(
     crop_type=None,
     overlay_type=None,
     quality="default",
+    preset="faster",
+    hwaccel="auto",
 ):
     """Create a video from image sequence with optional overlay and cropping.
 
@@ -184,6 +262,11 @@ def create_video_with_overlay(
             - "prores": Apple ProRes 422
             - "proreshq": Apple ProRes 422 HQ
             - "gif": Animated GIF
+        preset (str, optional): libx264 speed/quality preset for the default
+            H.264 output. Defaults to "faster".
+        hwaccel (str, optional): "auto" to use a working hardware H.264 encoder
+            (VideoToolbox, NVENC or Quick Sync) when one is found, "none" to
+            always use libx264. Defaults to "auto".
 
     Returns:
         str: Path to the output video file
@@ -230,29 +313,46 @@ def create_video_with_overlay(
     # Ensure output directory exists
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-    # Create a temporary directory for intermediate files if none specified
-    temp_dir = tempfile.mkdtemp(dir=os.path.dirname(output_file))
+    # Create a temporary directory for intermediate files (the GIF palette)
+    temp_dir = _make_scratch_dir(os.path.dirname(output_file))
 
     try:
-        # Create a temporary file for the image list
-        image_list_path = os.path.join(temp_dir, "image_list.txt")
-        with open(image_list_path, "w") as f:
-            for img_path, date_str in image_date_files:
-                f.write(f"file '{img_path}'\n")
-                f.write(f"duration {1/fps}\n")
-                if overlay_type == "date" and date_str:
-                    # Escape special characters in the date string
-                    escaped_date = (
-                        date_str.replace("'", "\\'")
-                        .replace(":", "\\:")
-                        .replace(" ", "\\ ")
-                    )
-                    f.write(f"file_packet_metadata date={escaped_date}\n")
+        # Every sequence is read through the concat demuxer from a list piped
+        # to ffmpeg on stdin, so no per-frame links are made in a scratch
+        # directory; only the date overlay attaches per-frame metadata
+        duration_line = f"duration {1.0 / fps:.6f}\n"
+        with_date = overlay_type == "date"
+        buf = bytearray()
+        for img_path, date_str in image_date_files:
+            buf += _concat_entry(
+                img_path, date_str if with_date else None, duration_line
+            ).encode("utf-8")
+        concat_input = bytes(buf)
+        input_args = [
+            "-protocol_whitelist",
+            "file,pipe",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            # Without an input rate the stream gets a 1/25 time base, and
+            # durations rounded to it make -r drop or repeat frames
+            "-r",
+            str(fps),
+            "-i",
+            "pipe:0",
+        ]
 
         # Get the first image to determine original dimensions
-        with Image.open(image_date_files[0][0]) as first_img:
-            orig_width, orig_height = first_img.size
-            orig_ratio = orig_width / orig_height
+        first_size = _read_image_size(image_date_files[0][0])
+        if first_size is None:
+            # Image.open only parses the header, so .size needs no decode; the
+            # pixels are never loaded here, so the bomb warning doesn't apply
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+                with Image.open(image_date_files[0][0]) as first_img:
+                    first_size = first_img.size
+        orig_width, orig_height = first_size
 
         # Build the video filter chain
         filter_chain = []
@@ -271,57 +371,16 @@ def create_video_with_overlay(
                 filter_chain.append(
                     "pad=w=1080:h=1080:x=(ow-iw)/2:y=(oh-ih)/2:color=black"
                 )
-            elif crop_type.startswith("hd"):
-                # HD: 1920x1080 (16:9)
-                target_width = 1920
-                target_height = 1080
-                target_ratio = target_width / target_height
-
-                if orig_ratio > target_ratio:
-                    # Image is wider than target, scale to height
-                    resize_height = target_height
-                    resize_width = int(orig_ratio * resize_height)
-                else:
-                    # Image is taller than target, scale to width
-                    resize_width = target_width
-                    resize_height = int(resize_width / orig_ratio)
-
-                # Calculate crop parameters based on crop type
-                if crop_type == "hd_keep_top":
-                    crop_y_offset = 0
-                elif crop_type == "hd_keep_bottom":
-                    crop_y_offset = resize_height - target_height
-                else:  # center
-                    crop_y_offset = int((resize_height - target_height) / 2)
-
-                filter_chain.append(f"scale={resize_width}:{resize_height}")
-                filter_chain.append(
-                    f"crop={target_width}:{target_height}:0:{crop_y_offset}"
+            else:
+                prefix, keep = crop_type.split("_", 1)
+                target_width, target_height = _CROP_TARGETS[prefix]
+                resize_width, resize_height, crop_y_offset = _compute_scale_crop(
+                    orig_width,
+                    orig_height,
+                    target_width,
+                    target_height,
+                    keep.removeprefix("keep_"),
                 )
-
-            elif crop_type.startswith("uhd"):
-                # UHD: 3840x2160 (16:9)
-                target_width = 3840
-                target_height = 2160
-                target_ratio = target_width / target_height
-
-                if orig_ratio > target_ratio:
-                    # Image is wider than target, scale to height
-                    resize_height = target_height
-                    resize_width = int(orig_ratio * resize_height)
-                else:
-                    # Image is taller than target, scale to width
-                    resize_width = target_width
-                    resize_height = int(resize_width / orig_ratio)
-
-                # Calculate crop parameters based on crop type
-                if crop_type == "uhd_keep_top":
-                    crop_y_offset = 0
-                elif crop_type == "uhd_keep_bottom":
-                    crop_y_offset = resize_height - target_height
-                else:  # center
-                    crop_y_offset = int((resize_height - target_height) / 2)
-
                 filter_chain.append(f"scale={resize_width}:{resize_height}")
                 filter_chain.append(
                     f"crop={target_width}:{target_height}:0:{crop_y_offset}"
@@ -341,8 +400,12 @@ def create_video_with_overlay(
                 fontsize = fontsize // 2  # Halve font size for GIF
 
             # Use the drawtext filter with metadata
+            font = get_system_font()
+            font_opt = (
+                f"fontfile='{font}'" if os.path.isfile(font) else f"font='{font}'"
+            )
             filter_chain.append(
-                f"drawtext=text='%{{metadata\\:date}}':fontcolor=white@0.8:fontsize={fontsize}:box=1:boxcolor=black@0.5:boxborderw=10:x=(w*0.9)-tw:y=(h*0.9)-th:fontfile=/System/Library/Fonts/Courier.dfont"
+                f"drawtext=text='%{{metadata\\:date}}':fontcolor=white@0.8:fontsize={fontsize}:box=1:boxcolor=black@0.5:boxborderw=10:x=(w*0.9)-tw:y=(h*0.9)-th:{font_opt}"
             )
         elif overlay_type == "frame":
             filter_chain.append(
@@ -350,30 +413,59 @@ def create_video_with_overlay(
             )
 
         # Build the ffmpeg command
-        cmd = [
+        # The filter graph (scale/crop/drawtext) is single-threaded unless told
+        # otherwise; a deeper input queue keeps the demuxer ahead of the encoder.
+        threads = str(os.cpu_count() or 4)
+        ffmpeg_base = [
             get_ffmpeg_path(),
             "-y",
-            "-f",
-            "concat",
-            "-safe",
-            "0",
-            "-i",
-            image_list_path,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-filter_threads",
+            threads,
+            "-filter_complex_threads",
+            threads,
+            "-thread_queue_size",
+            "1024",
+            *input_args,
         ]
+        cmd = list(ffmpeg_base)
 
         # Add filter chain if needed
         if quality == "gif":
-            # For GIF output, we need to:
-            # 1. Use palettegen to generate an optimal color palette
-            # 2. Use paletteuse to apply the palette
-            # 3. Set appropriate GIF parameters
+            # Two passes keep memory bounded: the palette is built from a
+            # thumbnail-subsampled stream first, so the encode pass no longer
+            # has to buffer every frame for a split palettegen/paletteuse graph.
             palette_path = os.path.join(temp_dir, "palette.png")
+            palette_cmd = [
+                *ffmpeg_base,
+                "-vf",
+                f"{','.join(filter_chain)},thumbnail=50,palettegen=max_colors=256:stats_mode=diff",
+                palette_path,
+            ]
+            print("Generating GIF palette:", " ".join(palette_cmd))
+            result = subprocess.run(
+                palette_cmd,
+                input=concat_input,
+                capture_output=True,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(
+                    _ffmpeg_failure_message(
+                        result.returncode,
+                        result.stderr.decode("utf-8", errors="replace"),
+                        palette_cmd,
+                    )
+                )
             cmd.extend(
                 [
-                    "-vf",
-                    f"{','.join(filter_chain)},split[s0][s1];[s0]palettegen=max_colors=256:stats_mode=full[p];[s1][p]paletteuse=dither=sierra2_4a:diff_mode=rectangle",
+                    "-i",
+                    palette_path,
+                    "-lavfi",
+                    f"[0:v]{','.join(filter_chain)}[x];[x][1:v]paletteuse=dither=sierra2_4a:diff_mode=rectangle",
                     "-loop",
-                    "1",  # Loop forever
+                    "0",  # Loop forever
                     "-f",
                     "gif",
                 ]
@@ -420,46 +512,73 @@ def create_video_with_overlay(
                 )
             else:
                 # Default to high quality H.264
-                cmd.extend(
-                    [
-                        "-c:v",
-                        "libx264",
-                        "-pix_fmt",
-                        "yuv420p",
-                        "-profile:v",
-                        "high",
-                        "-crf",
-                        "18",  # High quality, visually lossless
-                    ]
-                )
+                encoder = detect_hw_encoder() if hwaccel == "auto" else "libx264"
+                if encoder != "libx264":
+                    cmd.extend(hw_encoder_args(encoder))
+                else:
+                    cmd.extend(
+                        [
+                            "-c:v",
+                            "libx264",
+                            "-pix_fmt",
+                            "yuv420p",
+                            "-profile:v",
+                            "high",
+                            "-crf",
+                            "18",  # High quality, visually lossless
+                            "-preset",
+                            preset,
+                        ]
+                    )
+                    if overlay_type is None:
+                        # Slideshow of stills: bias psy-rd towards flat frames
+                        cmd.extend(["-tune", "stillimage"])
 
             # Add framerate
             cmd.extend(["-r", str(fps)])
 
+        # Let the encoder pick its own thread count for the available cores
+        cmd.extend(["-threads", "0"])
+
+        # Machine-readable progress on stdout (key=value lines) instead of
+        # scraping the carriage-return status line from stderr
+        cmd.extend(["-progress", "pipe:1", "-nostats"])
+
         # Add output file
         cmd.append(output_file)
 
         # Run ffmpeg command
         print("Running ffmpeg command:", " ".join(cmd))
-        with tqdm(total=len(image_date_files), desc="Rendering video") as pbar:
+        with (
+            tqdm(total=len(image_date_files), desc="Rendering video") as pbar,
+            tempfile.TemporaryFile() as stderr_file,
+        ):
             process = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
             )
-            while True:
-                output = process.stderr.readline()
-                if output == b"" and process.poll() is not None:
-                    break
-                if output:
-                    # Update progress bar based on frame count
-                    if b"frame=" in output:
-                        try:
-                            frame = int(output.split(b"frame=")[1].split(b" ")[0])
-                            pbar.update(frame - pbar.n)
-                        except:
-                            pass
+            # ffmpeg reads the whole list while opening the input, before it
+            # writes any progress, so this cannot deadlock on stdout
+            try:
+                process.stdin.write(concat_input)
+                process.stdin.close()
+            except BrokenPipeError:
+                pass  # ffmpeg exited early; its stderr explains why
+            for line in process.stdout:
+                if line.startswith(b"frame="):
+                    value = line[6:].strip()
+                    if value.isdigit():
+                        pbar.update(int(value) - pbar.n)
+            process.wait()
 
             if process.returncode != 0:
-                raise RuntimeError("ffmpeg command failed")
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode("utf-8", errors="replace")
+                raise RuntimeError(
+                    _ffmpeg_failure_message(process.returncode, stderr, cmd)
+                )
 
         return output_file
     finally:
@@ -467,35 +586,6 @@ def create_video_with_overlay(
         shutil.rmtree(temp_dir)
 
 
-def find_image_directories(root_dir):
-    """Find all directories containing image files.
-
-    Args:
-        root_dir (str): Root directory to search in
-
-    Returns:
-        list: List of directory paths containing images
-
-    The function:
-    1. Walks through directory tree
-    2. Checks for common image file extensions
-    3. Returns list of directories containing images
-    4. Skips hidden directories and files
-    """
-    image_extensions = {".jpg", ".jpeg", ".png", ".tiff", ".bmp"}
-    dirs_with_images = []
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
-        has_images = any(
-            any(f.lower().endswith(ext) for ext in image_extensions)
-            for f in filenames
-            if not f.startswith(".")
-        )
-        if has_images:
-            dirs_with_images.append(dirpath)
-    return dirs_with_images
-
-
 def main():
     """Command-line interface for the SISR package.
 
@@ -557,6 +647,28 @@ def main():
         default="default",
         help="Video quality setting (default: default)",
     )
+    parser.add_argument(
+        "--preset",
+        choices=[
+            "ultrafast",
+            "superfast",
+            "veryfast",
+            "faster",
+            "fast",
+            "medium",
+            "slow",
+            "slower",
+            "veryslow",
+        ],
+        default="faster",
+        help="libx264 encoder preset for default quality (default: faster)",
+    )
+    parser.add_argument(
+        "--hwaccel",
+        choices=["auto", "none"],
+        default="auto",
+        help="Use a hardware H.264 encoder when available (default: auto)",
+    )
 
     args = parser.parse_args()
 
@@ -636,12 +748,7 @@ def main():
         image_date_files = create_date_files(args.input, date_files_dir)
     else:
         # For non-date overlays, just get the image paths
-        image_files = []
-        for ext in ["*.jpg", "*.jpeg", "*.png", "*.tiff", "*.bmp"]:
-            image_files.extend(glob.glob(os.path.join(args.input, ext)))
-            image_files.extend(glob.glob(os.path.join(args.input, ext.upper())))
-        image_files.sort()
-        image_date_files = [(img, None) for img in image_files]
+        image_date_files = [(img, None) for img in _list_images(args.input)]
 
     if not image_date_files:
         print("No images found to process")
@@ -654,6 +761,8 @@ def main():
         crop_type=crop_type,
         overlay_type=overlay,
         quality=args.quality,
+        preset=args.preset,
+        hwaccel=args.hwaccel,
     )
 
 
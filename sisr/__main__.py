@@ -11,27 +11,43 @@ allowing users to:
 - Set quality options
 """
 
+import multiprocessing
 import os
 import sys
 import argparse
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from operator import itemgetter
 from typing import Optional, List, Tuple
 from sisr.core import (
+    DATE_SOURCES,
+    _is_contiguous,
+    _output_names,
     create_video_with_overlay,
     find_image_directories,
     create_date_files,
 )
-from sisr.gui import main as gui_main
 from sisr.utils import get_ffmpeg_path
 
+# Image file extensions picked up from each input directory
+_EXTS = frozenset({"jpg", "jpeg", "png", "tiff", "bmp"})
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments.
+# Output container extension per --quality (anything else is MP4)
+_QUALITY_EXT = {"gif": ".gif", "prores": ".mov", "proreshq": ".mov"}
+
+# First run of digits in a file name, used to check the sequence is contiguous
+_SEQ_NUM_RE = re.compile(r"(\d+)")
+
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser once per process.
 
     Returns:
-        Parsed command line arguments
+        Argument parser for the CLI
 
-    The function defines and parses the following arguments:
+    The parser defines the following arguments:
     - input: Input directory containing images
     - output-dir: Output directory for rendered video
     - fps: Frames per second (default: 30)
@@ -42,6 +58,9 @@ def parse_args() -> argparse.Namespace:
     - overlay-date: Add date overlay
     - overlay-frame: Add frame number overlay
     - quality: Output quality (default, prores, proreshq, gif)
+    - preset: libx264 preset for default quality
+    - hwaccel: Hardware H.264 encoding (auto, none)
+    - date-from: Date overlay source (auto, exif, filename)
     """
     parser = argparse.ArgumentParser(description="Simple Image Sequence Renderer")
 
@@ -97,6 +116,30 @@ def parse_args() -> argparse.Namespace:
         help="Output quality",
     )
 
+    # Encoder options for default-quality MP4 output
+    parser.add_argument(
+        "--preset",
+        choices=[
+            "ultrafast",
+            "superfast",
+            "veryfast",
+            "faster",
+            "fast",
+            "medium",
+            "slow",
+            "slower",
+            "veryslow",
+        ],
+        default="faster",
+        help="libx264 encoder preset for default quality (default: faster)",
+    )
+    parser.add_argument(
+        "--hwaccel",
+        choices=["auto", "none"],
+        default="auto",
+        help="Use a hardware H.264 encoder when available (default: auto)",
+    )
+
     # Max width/height options (only valid if no crop is selected)
     parser.add_argument(
         "--max-width", type=int, help="Maximum output width (only if no crop mode)"
@@ -105,7 +148,36 @@ def parse_args() -> argparse.Namespace:
         "--max-height", type=int, help="Maximum output height (only if no crop mode)"
     )
 
-    return parser.parse_args()
+    # Where the date overlay takes each image's date from
+    parser.add_argument(
+        "--date-from",
+        choices=DATE_SOURCES,
+        default="auto",
+        help="Date overlay source: timestamp in the file name, falling back "
+        "to EXIF (auto), EXIF only, or file name only (default: auto)",
+    )
+
+    # Parallel rendering of multiple image directories
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of image directories to render at once (default: 1)",
+    )
+
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Args:
+        argv: Arguments to parse (defaults to ``sys.argv[1:]``)
+
+    Returns:
+        Parsed command line arguments
+    """
+    return _build_parser().parse_args(argv)
 
 
 def validate_args(args: argparse.Namespace) -> None:
@@ -130,11 +202,13 @@ def validate_args(args: argparse.Namespace) -> None:
 
     # Check resolution format
     if args.resolution:
-        try:
-            width, height = map(int, args.resolution.split("x"))
-            if width <= 0 or height <= 0:
-                raise ValueError
-        except ValueError:
+        width, sep, height = args.resolution.partition("x")
+        if (
+            not sep
+            or not (width.isdecimal() and height.isdecimal())
+            or int(width) == 0
+            or int(height) == 0
+        ):
             raise ValueError("Resolution must be in format WxH with positive integers")
 
     # Max width/height only allowed if no crop
@@ -148,6 +222,32 @@ def validate_args(args: argparse.Namespace) -> None:
         raise ValueError("--max-width must be a positive integer")
     if args.max_height is not None and args.max_height <= 0:
         raise ValueError("--max-height must be a positive integer")
+    if args.jobs < 1:
+        raise ValueError("--jobs must be a positive integer")
+
+
+def _scan_numbered_images(dir_path: str) -> List[Tuple[int, str]]:
+    """List a directory's images with their sequence numbers in one pass.
+
+    Args:
+        dir_path: Directory to scan
+
+    Returns:
+        (sequence number, path) tuples sorted by number; files without a
+        number in their name are left out
+    """
+    numbered = []
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            name = entry.name
+            _, dot, ext = name.rpartition(".")
+            if not dot or ext.lower() not in _EXTS or not entry.is_file():
+                continue
+            match = _SEQ_NUM_RE.search(name)
+            if match:
+                numbered.append((int(match.group(1)), entry.path))
+    numbered.sort(key=itemgetter(0))
+    return numbered
 
 
 def get_crop_type(args: argparse.Namespace) -> Optional[str]:
@@ -184,9 +284,90 @@ def get_overlay_type(args: argparse.Namespace) -> Optional[str]:
     return None
 
 
-def main() -> None:
+def _process_directory(
+    dir_path: str,
+    output_name: str,
+    args: argparse.Namespace,
+    crop_type: Optional[str],
+    overlay_type: Optional[str],
+    output_suffix: str,
+) -> None:
+    """Render one image directory to a video in ``args.output_dir``.
+
+    Args:
+        dir_path: Directory containing the image sequence
+        output_name: Output file name before the suffix, from ``_output_names``
+        args: Parsed command line arguments
+        crop_type: Crop type from ``get_crop_type``
+        overlay_type: Overlay type from ``get_overlay_type``
+        output_suffix: Overlay suffix and extension appended to
+            ``output_name`` to form the output file name
+    """
+    # Create output filename
+    dir_name = os.path.basename(dir_path)
+    output_file = os.path.join(args.output_dir, f"{output_name}{output_suffix}")
+
+    print(f"Processing directory: {dir_path}")
+    print(f"Output file: {output_file}")
+
+    # Get image files with dates if using date overlay
+    if overlay_type == "date":
+        print("Creating date files...")
+        dated = create_date_files(dir_path, args.output_dir, args.date_from)
+        # The concat list plays frames in list order, so sort by the text
+        # before the sequence number and then the number (unpadded names sort
+        # as text otherwise). Images without a number stay in, placed by name.
+        keyed = []
+        numbers = []
+        for frame in dated:
+            name = os.path.basename(frame[0])
+            match = _SEQ_NUM_RE.search(name)
+            if match:
+                n = int(match.group(1))
+                numbers.append(n)
+                keyed.append(((name[: match.start()], n, name), frame))
+            else:
+                keyed.append(((name, -1, name), frame))
+        keyed.sort(key=itemgetter(0))
+        frames = [frame for _, frame in keyed]
+    else:
+        # For non-date overlays, one directory pass gives paths and numbers;
+        # plain paths are passed on, with no (path, None) tuple per frame
+        numbered = _scan_numbered_images(dir_path)
+        frames = [path for _, path in numbered]
+        numbers = (n for n, _ in numbered)
+    if not frames:
+        print(f"No images found in {dir_path}")
+        return
+    # Check for sequentially named images
+    if not _is_contiguous(numbers):
+        print(
+            f"Error: The directory '{dir_name}' does not contain a sequentially named image sequence. Please ensure your images are named in order (e.g., img_0001.jpg, img_0002.jpg, ...). Skipping."
+        )
+        return
+
+    print(f"Found {len(frames)} images")
+
+    create_video_with_overlay(
+        image_date_files=frames,
+        output_file=output_file,
+        fps=args.fps,
+        crop_type=crop_type,
+        overlay_type=overlay_type,
+        quality=args.quality,
+        max_width=args.max_width,
+        max_height=args.max_height,
+        preset=args.preset,
+        hwaccel=args.hwaccel,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Main entry point for the CLI application.
 
+    Args:
+        argv: Command line arguments (defaults to ``sys.argv[1:]``)
+
     The function:
     1. If no arguments are provided, launches the GUI
     2. Otherwise, parses command line arguments and runs in CLI mode
@@ -194,99 +375,59 @@ def main() -> None:
     4. Processes each image directory
     5. Creates videos with specified options
     """
+    if argv is None:
+        argv = sys.argv[1:]
     # If no arguments are provided, launch the GUI
-    if len(sys.argv) == 1:
+    if not argv:
+        # Imported here so CLI runs don't pay for loading Tk
+        from sisr.gui import main as gui_main
+
         gui_main()
         return
 
-    args = parse_args()
+    args = parse_args(argv)
     try:
         validate_args(args)
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
 
-    # Validate input directory
-    if not os.path.isdir(args.input):
-        print(f"Error: Input directory '{args.input}' does not exist")
-        sys.exit(1)
-
-    # Create output directory if it doesn't exist
-    os.makedirs(args.output_dir, exist_ok=True)
-
-    # Find all image directories
-    image_dirs = find_image_directories(args.input)
+    # Find all image directories. The whole tree is walked before rendering
+    # so that folders sharing a name get distinct output files.
+    image_dirs = list(find_image_directories(args.input))
     if not image_dirs:
         print(f"No image directories found in '{args.input}'")
         sys.exit(1)
+    names = _output_names(args.input, image_dirs)
+
+    # These depend only on the arguments, so work them out once for all
+    # directories
+    crop_type = get_crop_type(args)
+    overlay_type = get_overlay_type(args)
+    ext = _QUALITY_EXT.get(args.quality, ".mp4")
+    overlay_suffix = {"date": "_date", "frame": "_frame"}.get(overlay_type, "")
+    process = partial(
+        _process_directory,
+        args=args,
+        crop_type=crop_type,
+        overlay_type=overlay_type,
+        output_suffix=f"{overlay_suffix}{ext}",
+    )
 
-    # Process each directory
-    for dir_path in image_dirs:
-        # Create output filename
-        dir_name = os.path.basename(dir_path)
-        # Set extension based on quality
-        if args.quality == "gif":
-            ext = ".gif"
-        elif args.quality in ["prores", "proreshq"]:
-            ext = ".mov"
-        else:
-            ext = ".mp4"
-
-        # Add overlay type to filename if specified
-        if args.overlay_date:
-            dir_name += "_date"
-        elif args.overlay_frame:
-            dir_name += "_frame"
-
-        output_file = os.path.join(args.output_dir, f"{dir_name}{ext}")
-
-        print(f"Processing directory: {dir_path}")
-        print(f"Output file: {output_file}")
-
-        # Get image files with dates if using date overlay
-        if args.overlay_date:
-            print("Creating date files...")
-            image_date_files = create_date_files(dir_path, args.output_dir)
-        else:
-            # For non-date overlays, just get the image paths
-            image_files = [
-                f
-                for f in sorted(os.listdir(dir_path))
-                if f.lower().endswith((".jpg", ".jpeg", ".png", ".tiff", ".bmp"))
-            ]
-            image_date_files = [(os.path.join(dir_path, f), None) for f in image_files]
-        if not image_date_files:
-            print(f"No images found in {dir_path}")
-            continue
-        # Check for sequentially named images
-        numbers = []
-        pattern = re.compile(r"(\d+)")
-        for img_path, _ in image_date_files:
-            match = pattern.search(os.path.basename(img_path))
-            if match:
-                numbers.append(int(match.group(1)))
-        numbers.sort()
-        if not numbers or numbers != list(range(numbers[0], numbers[0] + len(numbers))):
-            print(
-                f"Error: The directory '{dir_name}' does not contain a sequentially named image sequence. Please ensure your images are named in order (e.g., img_0001.jpg, img_0002.jpg, ...). Skipping."
-            )
-            continue
-
-        print(f"Found {len(image_date_files)} images")
-
-        create_video_with_overlay(
-            image_date_files=image_date_files,
-            output_file=output_file,
-            fps=args.fps,
-            crop_type=get_crop_type(args),
-            overlay_type=get_overlay_type(args),
-            quality=args.quality,
-            max_width=args.max_width,
-            max_height=args.max_height,
-        )
+    # Process each directory; each render is an ffmpeg subprocess, so threads
+    # are enough to run several at once
+    if args.jobs > 1:
+        with ThreadPoolExecutor(max_workers=args.jobs) as ex:
+            list(ex.map(process, image_dirs, names))
+    else:
+        for dir_path, name in zip(image_dirs, names):
+            process(dir_path, name)
 
     print("Rendering completed successfully")
 
 
 if __name__ == "__main__":
+    # Date extraction uses a process pool; frozen (PyInstaller) builds need
+    # this before anything else runs in a spawned worker
+    multiprocessing.freeze_support()
     main()
@@ -12,22 +12,27 @@ It supports:
 - Temporary file handling
 """
 
+import json
+import logging
 import os
+import re
 import sys
 import shlex
 import subprocess
+import struct
 import tempfile
-import shutil
-import glob
+import threading
 from datetime import datetime
-from typing import List, Tuple, Optional, Union, Dict, Any
-from PIL import Image, ImageFont, ImageDraw
-import piexif
+from typing import Iterable, Iterator, List, Tuple, Optional, Union, Dict, Any
+from PIL import Image
 import platform
 from tqdm import tqdm
-import atexit
-from collections import deque
-from .utils import get_ffmpeg_path
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from .utils import detect_hw_encoder, get_ffmpeg_path, hw_encoder_args
+
+logger = logging.getLogger(__name__)
 
 
 def _truncate_stderr(text: str, max_total: int = 14000) -> str:
@@ -90,171 +95,565 @@ def inspect_exif(image_path: str) -> None:
     """
     print(f"\nInspecting EXIF data for: {image_path}")
     try:
-        # Try PIL first
         with Image.open(image_path) as img:
-            print("\nPIL EXIF data:")
-            exif_data = img._getexif() if hasattr(img, "_getexif") else None
-            if exif_data:
-                for tag_id, value in exif_data.items():
-                    print(f"Tag {tag_id}: {value}")
-            else:
+            exif = img.getexif()
+            if not exif:
                 print("No EXIF data found in PIL")
-
-            # Try piexif
-            try:
-                print("\nPiexif data:")
-                exif_dict = piexif.load(img.info.get("exif", b""))
-                for ifd in ("0th", "Exif", "GPS", "1st"):
-                    if ifd in exif_dict:
-                        print(f"\n{ifd} IFD:")
-                        for tag_id, value in exif_dict[ifd].items():
-                            print(f"Tag {tag_id}: {value}")
-            except Exception as e:
-                print(f"Piexif error: {e}")
+                return
+            ifds = (("0th", exif), ("Exif", exif.get_ifd(0x8769)))
+            ifds += (("GPS", exif.get_ifd(0x8825)),)
+            for name, ifd in ifds:
+                if ifd:
+                    print(f"\n{name} IFD:")
+                    for tag_id, value in ifd.items():
+                        print(f"Tag {tag_id}: {value}")
     except Exception as e:
         print(f"Error inspecting image: {e}")
 
 
-def extract_date_time(image_path: str) -> str:
+_EXIF_HEADER = b"Exif\x00\x00"
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_JPEG_HEADER_BYTES = 64 * 1024
+# One 12-byte IFD entry: tag, type, count, value/offset field
+_IFD_ENTRY = {e: struct.Struct(e + "HHI4s") for e in "<>"}
+
+
+def _ifd_find(
+    tiff: bytes, endian: str, offset: int, tag: int
+) -> Optional[Tuple[int, int, bytes]]:
+    """Return (type, count, raw value field) for ``tag`` in the IFD at ``offset``."""
+    if offset + 2 > len(tiff):
+        return None
+    (num_entries,) = struct.unpack_from(endian + "H", tiff, offset)
+    entry_struct = _IFD_ENTRY[endian]
+    for i in range(num_entries):
+        pos = offset + 2 + 12 * i
+        if pos + 12 > len(tiff):
+            break
+        entry_tag, entry_type, count, field = entry_struct.unpack_from(tiff, pos)
+        if entry_tag == tag:
+            return entry_type, count, field
+    return None
+
+
+def _ifd_ascii(
+    tiff: bytes, endian: str, entry: Optional[Tuple[int, int, bytes]]
+) -> Optional[str]:
+    """Decode an ASCII IFD entry found by ``_ifd_find``."""
+    if not entry or entry[0] != 2:  # ASCII
+        return None
+    _, count, field = entry
+    if count <= 4:
+        raw = field[:count]
+    else:
+        (value_offset,) = struct.unpack(endian + "I", field)
+        raw = tiff[value_offset : value_offset + count]
+    value = raw.split(b"\x00", 1)[0].decode("ascii", "replace").strip()
+    return value or None
+
+
+def _tiff_datetime(tiff: bytes) -> Optional[str]:
+    """Read DateTimeOriginal (Exif IFD) or else DateTime (IFD0) from a TIFF blob.
+
+    Only the IFD entries on the way to those two tags are visited; the rest of
+    the EXIF tree (maker notes, thumbnail) is never decoded.
+    """
+    if len(tiff) < 8:
+        return None
+    if tiff[:2] == b"II":
+        endian = "<"
+    elif tiff[:2] == b"MM":
+        endian = ">"
+    else:
+        return None
+    (ifd0_offset,) = struct.unpack_from(endian + "I", tiff, 4)
+    pointer = _ifd_find(tiff, endian, ifd0_offset, 0x8769)  # ExifIFD pointer
+    if pointer:
+        (exif_offset,) = struct.unpack(endian + "I", pointer[2])
+        value = _ifd_ascii(
+            tiff, endian, _ifd_find(tiff, endian, exif_offset, 0x9003)
+        )  # DateTimeOriginal
+        if value:
+            return value
+    return _ifd_ascii(tiff, endian, _ifd_find(tiff, endian, ifd0_offset, 0x0132))
+
+
+def _jpeg_exif_blob(f) -> Optional[bytes]:
+    """Return the TIFF payload of the first EXIF APP1 segment of a JPEG file."""
+    data = f.read(_JPEG_HEADER_BYTES)
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # markers without length
+            pos += 2
+            continue
+        if marker in (0xD9, 0xDA):  # EOI / start of scan: no metadata beyond here
+            return None
+        (length,) = struct.unpack_from(">H", data, pos + 2)
+        end = pos + 2 + length
+        if marker == 0xE1 and data[pos + 4 : pos + 10] == _EXIF_HEADER:
+            if end > len(data):
+                data += f.read(end - len(data))
+            return data[pos + 10 : end]
+        pos = end
+    return None
+
+
+def _png_exif_blob(f) -> Optional[bytes]:
+    """Return the contents of a PNG ``eXIf`` chunk, skipping over image data."""
+    f.seek(len(_PNG_SIGNATURE))
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        length, chunk_type = struct.unpack(">I4s", header)
+        if chunk_type == b"eXIf":
+            blob = f.read(length)
+            return blob[6:] if blob.startswith(_EXIF_HEADER) else blob
+        if chunk_type == b"IEND":
+            return None
+        f.seek(length + 4, os.SEEK_CUR)  # chunk data + CRC
+
+
+def _exif_blob(image_path: str) -> Optional[bytes]:
+    """Return the TIFF payload of a JPEG's APP1 segment or a PNG's eXIf chunk."""
+    try:
+        with open(image_path, "rb") as f:
+            head = f.read(len(_PNG_SIGNATURE))
+            if head[:2] == b"\xff\xd8":
+                f.seek(0)
+                return _jpeg_exif_blob(f)
+            if head == _PNG_SIGNATURE:
+                return _png_exif_blob(f)
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def _fast_datetime(image_path: str) -> Optional[str]:
+    """Read the capture date by seeking straight to the EXIF block.
+
+    Handles the JPEG APP1 segment and the PNG ``eXIf`` chunk without decoding
+    the image or the rest of the EXIF tree. Returns None for other formats or
+    when the tag is missing, so callers can fall back to the full parsers.
+    """
+    blob = _exif_blob(image_path)
+    if not blob:
+        return None
+    try:
+        return _tiff_datetime(blob)
+    except struct.error:
+        return None
+
+
+# EXIF orientations that turn the image by 90 degrees (width and height swap)
+_TRANSPOSED_ORIENTATIONS = frozenset({5, 6, 7, 8})
+
+
+def _exif_orientation(image_path: str) -> int:
+    """Return the IFD0 Orientation tag of a JPEG/PNG, or 1 when absent."""
+    blob = _exif_blob(image_path)
+    if not blob or len(blob) < 8 or blob[:2] not in (b"II", b"MM"):
+        return 1
+    endian = "<" if blob[:2] == b"II" else ">"
+    try:
+        (ifd0_offset,) = struct.unpack_from(endian + "I", blob, 4)
+        entry = _ifd_find(blob, endian, ifd0_offset, 0x0112)
+        if not entry or entry[0] != 3:  # SHORT
+            return 1
+        (orientation,) = struct.unpack_from(endian + "H", entry[2])
+    except struct.error:
+        return 1
+    return orientation
+
+
+# Start-of-frame markers carry the frame size; C4/C8/CC share the range but are
+# DHT, JPG and DAC segments.
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_size(f) -> Optional[Tuple[int, int]]:
+    """Return (width, height) from a JPEG start-of-frame header, seeking past segments."""
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        while code == 0xFF:  # fill bytes
+            code = f.read(1)[0]
+        if code == 0x01 or 0xD0 <= code <= 0xD8:  # markers without length
+            continue
+        if code in (0xD9, 0xDA):  # EOI / start of scan before any SOF
+            return None
+        (length,) = struct.unpack(">H", f.read(2))
+        if code in _JPEG_SOF_MARKERS:
+            _precision, height, width = struct.unpack(">BHH", f.read(5))
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _read_image_size(image_path: str) -> Optional[Tuple[int, int]]:
+    """Read (width, height) from the JPEG SOF or PNG IHDR header.
+
+    Only the header bytes are read, so no decoder is initialised. Returns None
+    for other formats or malformed files; callers fall back to PIL.
+    """
+    try:
+        with open(image_path, "rb") as f:
+            head = f.read(24)
+            if head[:2] == b"\xff\xd8":
+                size = _jpeg_size(f)
+            elif head[:8] == _PNG_SIGNATURE and head[12:16] == b"IHDR":
+                size = struct.unpack(">II", head[16:24])
+            else:
+                return None
+    except (OSError, struct.error, IndexError):
+        return None
+    if not size or not size[0] or not size[1]:
+        return None
+    return size[0], size[1]
+
+
+# YYYYMMDD?HHMMSS timestamp embedded in a file name, e.g.
+# IMG_20240101_120000_0001.jpg or 2024-01-01T12-00-00.jpg
+_FILENAME_TS_RE = re.compile(
+    r"(?<!\d)((?:19|20)\d{2})[:_-]?(\d{2})[:_-]?(\d{2})[_ T-]?"
+    r"(\d{2})[:_-]?(\d{2})[:_-]?(\d{2})(?!\d)"
+)
+
+# Accepted values for the date_from argument of extract_date_time
+DATE_SOURCES = ("auto", "exif", "filename")
+
+
+def _filename_datetime(image_path: str) -> Optional[datetime]:
+    """Return the timestamp embedded in the file name, or None."""
+    match = _FILENAME_TS_RE.search(os.path.basename(image_path))
+    if not match:
+        return None
+    try:
+        return datetime(*map(int, match.groups()))
+    except ValueError:
+        return None
+
+
+def extract_date_time(image_path: str, date_from: str = "auto") -> str:
     """Extract date and time from image metadata.
 
     Args:
         image_path: Path to the image file
+        date_from: Where to look for the date: "auto" (file name, then EXIF),
+            "exif" (EXIF only) or "filename" (file name only)
+
+    Returns:
+        The display date (e.g. 'Monday, January 01, 2024 12:00PM') when one is
+        found in the file name or EXIF, otherwise the file time in format
+        'YYYY:MM:DD HH:MM:SS'
+    """
+    dt, display_fmt = _extract_datetime(image_path, date_from)
+    return dt.strftime(display_fmt or _EXIF_DT_FMT)
+
+
+def _extract_datetime(
+    image_path: str, date_from: str = "auto"
+) -> Tuple[datetime, Optional[str]]:
+    """Find an image's date without formatting it.
+
+    Args:
+        image_path: Path to the image file
+        date_from: Date source, as for ``extract_date_time``
 
     Returns:
-        Date and time in format 'YYYY:MM:DD HH:MM:SS'
+        (datetime, display format) where the format is None when the date is
+        the file modification time (or the current time) fallback
 
     The function tries multiple methods to extract the date:
-    1. EXIF data using PIL
-    2. EXIF data using piexif
-    3. File modification time as fallback
+    1. A timestamp in the file name (unless date_from is "exif"), which
+       needs no file I/O
+    2. DateTimeOriginal (or DateTime) read directly from the JPEG/PNG EXIF block
+    3. EXIF data using PIL, for formats the direct read does not cover
+    4. File modification time as fallback
     """
+    if date_from != "exif":
+        dt = _filename_datetime(image_path)
+        if dt is not None:
+            return dt, _DISPLAY_DT_FMT
+        if date_from == "filename":
+            # No timestamp in the name; skip EXIF and use the file time
+            try:
+                return datetime.fromtimestamp(os.path.getmtime(image_path)), None
+            except OSError:
+                return datetime.now(), None
     try:
-        # Try PIL first
+        date_str = _fast_datetime(image_path)
+        if date_str:
+            parsed = _parse_date(date_str)
+            if parsed:
+                return parsed
+
+        # Fall back to PIL for formats the direct EXIF read does not cover
         with Image.open(image_path) as img:
-            exif_data = img._getexif() if hasattr(img, "_getexif") else None
+            # getexif() parses IFD0 only and the Exif sub-IFD on request,
+            # rather than _getexif() building a dict of every tag in every IFD
+            exif = img.getexif()
+            exif_data = exif.get_ifd(0x8769) if exif else None
 
-            if exif_data:
+            if exif:
                 # Try DateTimeOriginal (36867) first
-                if 36867 in exif_data:
+                if exif_data and 36867 in exif_data:
                     date_str = exif_data[36867]
                     if date_str and isinstance(date_str, str):
-                        formatted_date = format_datetime(date_str)
-                        if formatted_date and validate_date(formatted_date):
-                            return formatted_date
+                        parsed = _parse_date(date_str)
+                        if parsed:
+                            return parsed
                 # Then try DateTime (306)
-                elif 306 in exif_data:
-                    date_str = exif_data[306]
+                elif 306 in exif:
+                    date_str = exif[306]
                     if date_str and isinstance(date_str, str):
-                        formatted_date = format_datetime(date_str)
-                        if formatted_date and validate_date(formatted_date):
-                            return formatted_date
-
-            # Try piexif if PIL didn't find it
-            try:
-                exif_bytes = img.info.get("exif", b"")
-                if exif_bytes:
-                    exif_dict = piexif.load(exif_bytes)
-
-                    # Check ExifIFD.DateTimeOriginal (36867)
-                    if (
-                        "Exif" in exif_dict
-                        and piexif.ExifIFD.DateTimeOriginal in exif_dict["Exif"]
-                    ):
-                        date_str = exif_dict["Exif"][
-                            piexif.ExifIFD.DateTimeOriginal
-                        ].decode("utf-8")
-                        if date_str and isinstance(date_str, str):
-                            formatted_date = format_datetime(date_str)
-                            if formatted_date and validate_date(formatted_date):
-                                return formatted_date
-                    # Check 0th.DateTime (306)
-                    elif "0th" in exif_dict and 306 in exif_dict["0th"]:
-                        date_str = exif_dict["0th"][306].decode("utf-8")
-                        if date_str and isinstance(date_str, str):
-                            formatted_date = format_datetime(date_str)
-                            if formatted_date and validate_date(formatted_date):
-                                return formatted_date
-                    # Check for Pentax-specific date fields
-                    elif "0th" in exif_dict:
-                        # Try to combine Date and Time fields if they exist
-                        date = (
-                            exif_dict["0th"].get(306, b"").decode("utf-8")
-                        )  # Date field
-                        time = (
-                            exif_dict["0th"].get(307, b"").decode("utf-8")
-                        )  # Time field
-                        if date and time:
-                            date_str = f"{date} {time}"
-                            if date_str and isinstance(date_str, str):
-                                formatted_date = format_datetime(date_str)
-                                if formatted_date and validate_date(formatted_date):
-                                    return formatted_date
-            except Exception:
-                pass
+                        parsed = _parse_date(date_str)
+                        if parsed:
+                            return parsed
 
         # If no EXIF data found, use file modification time
-        mod_time = os.path.getmtime(image_path)
-        date = datetime.fromtimestamp(mod_time).strftime("%Y:%m:%d %H:%M:%S")
-        return date
+        return datetime.fromtimestamp(os.path.getmtime(image_path)), None
     except Exception:
         # Return current time as fallback
-        date = datetime.now().strftime("%Y:%m:%d %H:%M:%S")
-        return date
+        return datetime.now(), None
+
+
+_EXIF_DT_FMT = "%Y:%m:%d %H:%M:%S"
+_DISPLAY_DT_FMT = "%A, %B %d, %Y %I:%M%p"
+_DISPLAY_DATE_FMT = "%A, %B %d, %Y"
+
+
+def _parse_exif_datetime(datetime_str: str) -> Optional[datetime]:
+    """Parse 'YYYY:MM:DD HH:MM:SS', slicing the fixed layout before strptime."""
+    s = datetime_str
+    if (
+        len(s) == 19
+        and s[4] == s[7] == s[13] == s[16] == ":"
+        and s[10] == " "
+        and s[:4].isdigit()
+    ):
+        try:
+            return datetime(
+                int(s[0:4]),
+                int(s[5:7]),
+                int(s[8:10]),
+                int(s[11:13]),
+                int(s[14:16]),
+                int(s[17:19]),
+            )
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(s, _EXIF_DT_FMT)
+    except ValueError:
+        return None
 
 
-def format_datetime(datetime_str: str) -> str:
-    """Format a date/time string for display.
+def _parse_date(date_str: str) -> Optional[Tuple[datetime, str]]:
+    """Parse an EXIF date into (datetime, display format), or None if invalid.
+
+    Dates without a time of day keep a date-only display format.
+    """
+    dt = _parse_exif_datetime(date_str)
+    if dt is not None:
+        return dt, _DISPLAY_DT_FMT
+    try:
+        return datetime.strptime(date_str, "%Y:%m:%d"), _DISPLAY_DATE_FMT
+    except ValueError:
+        return None
+
+
+def format_datetime(datetime_str: Union[str, datetime]) -> str:
+    """Format a date/time for display.
 
     Args:
-        datetime_str: Date/time string in format 'YYYY:MM:DD HH:MM:SS'
+        datetime_str: A datetime, or a date/time string in format
+            'YYYY:MM:DD HH:MM:SS'
 
     Returns:
         Formatted date/time string like 'Monday, January 1, 2024 12:00PM'
 
     If the input string cannot be parsed, returns it unchanged.
     """
+    if isinstance(datetime_str, datetime):
+        return datetime_str.strftime(_DISPLAY_DT_FMT)
+    # Already-formatted display dates (and other text) can't match either
+    # EXIF layout, so skip the strptime attempts
+    if not datetime_str[:1].isdigit():
+        return datetime_str
+    dt = _parse_exif_datetime(datetime_str)
+    if dt is not None:
+        return dt.strftime(_DISPLAY_DT_FMT)
     try:
-        # Try parsing with the standard format
-        dt = datetime.strptime(datetime_str, "%Y:%m:%d %H:%M:%S")
-        formatted = dt.strftime("%A, %B %d, %Y %I:%M%p")
-        return formatted
+        # Try parsing with just the date part
+        dt = datetime.strptime(datetime_str, "%Y:%m:%d")
+        return dt.strftime(_DISPLAY_DATE_FMT)
     except ValueError:
-        try:
-            # Try parsing with just the date part
-            dt = datetime.strptime(datetime_str, "%Y:%m:%d")
-            formatted = dt.strftime("%A, %B %d, %Y")
-            return formatted
-        except ValueError:
-            return datetime_str
+        return datetime_str
+
+
+# Below this many images, process start-up costs more than it saves
+_PARALLEL_MIN_IMAGES = 64
+
+# Image file extensions (lower case, without the dot) read from a directory
+_IMAGE_EXTS = frozenset({"jpg", "jpeg", "png", "tiff", "bmp"})
+
+# Formatted dates from earlier runs, kept in the output directory
+_DATE_CACHE_NAME = ".date_cache.json"
 
+# Held while a date cache is re-read, merged and replaced, so parallel renders
+# into one output directory keep each other's entries
+_DATE_CACHE_LOCK = threading.Lock()
 
-def validate_date(date_str: str) -> bool:
-    """Validate if a string is a properly formatted date.
+
+def _list_images(image_dir: str) -> List[str]:
+    """List the image files in a directory, sorted by path.
+
+    One directory pass instead of a glob per extension and case; like glob,
+    hidden files are skipped.
 
     Args:
-        date_str: Date string to validate
+        image_dir: Directory to scan
 
     Returns:
-        True if valid date, False otherwise
+        Sorted image file paths
     """
-    try:
-        datetime.strptime(date_str, "%A, %B %d, %Y %I:%M%p")
-        return True
-    except ValueError:
-        try:
-            datetime.strptime(date_str, "%A, %B %d, %Y")
-            return True
-        except ValueError:
+    image_files = []
+    with os.scandir(image_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith("."):
+                continue
+            _, dot, ext = name.rpartition(".")
+            if dot and ext.lower() in _IMAGE_EXTS and entry.is_file():
+                image_files.append(entry.path)
+    image_files.sort()
+    return image_files
+
+
+def _is_contiguous(numbers: Iterable[int]) -> bool:
+    """Return True if sequence numbers (in any order) form an unbroken run.
+
+    Tracks min/max while stopping at the first duplicate, so no sort or
+    intermediate list is needed.
+    """
+    seen = set()
+    low = high = None
+    for n in numbers:
+        if n in seen:
             return False
+        seen.add(n)
+        if low is None or n < low:
+            low = n
+        if high is None or n > high:
+            high = n
+    # Contiguous iff the span matches the count
+    return bool(seen) and high - low == len(seen) - 1
+
+
+def _output_names(input_dir: str, image_dirs: List[str]) -> List[str]:
+    """Name the video of each image directory, without two sharing a file.
+
+    Directories are named after their folder; when several folders share a
+    name, each is named after its path below input_dir instead (``day1/cam``
+    becomes ``day1_cam``), with a number added if that still clashes.
+
+    Args:
+        input_dir: Directory the image directories were found under
+        image_dirs: Image directories, in render order
+
+    Returns:
+        Output file name (without extension) per directory
+    """
+    counts = Counter(os.path.basename(d) for d in image_dirs)
+    names = []
+    # Case-insensitive, as on the default macOS and Windows file systems
+    taken = set()
+    for dir_path in image_dirs:
+        name = os.path.basename(dir_path)
+        if counts[name] > 1:
+            rel = os.path.relpath(dir_path, input_dir)
+            if rel != os.curdir:
+                name = rel.replace(os.sep, "_")
+        unique, n = name, 2
+        while unique.casefold() in taken:
+            unique = f"{name}_{n}"
+            n += 1
+        taken.add(unique.casefold())
+        names.append(unique)
+    return names
+
+
+def _load_date_cache(cache_path: str) -> Dict[str, List[Any]]:
+    """Load the date cache, or return an empty one if missing or unreadable.
+
+    Entries map an absolute image path to [st_mtime_ns, st_size, date_from,
+    formatted date].
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
 
 
-def create_date_files(image_dir: str, output_dir: str) -> List[Tuple[str, str]]:
+def _save_date_cache(
+    cache_path: str, image_dir: str, entries: Dict[str, List[Any]]
+) -> None:
+    """Replace one directory's entries in the date cache, writing it atomically.
+
+    The file is re-read under a lock so entries saved by other renders since
+    this one loaded it are kept. Entries for images no longer in ``image_dir``
+    are dropped. Failures only cost the next run time.
+    """
+    image_dir = os.path.abspath(image_dir)
+    # Unique per writer, so another process saving into the same output
+    # directory cannot collide with it
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with _DATE_CACHE_LOCK:
+        cache = {
+            key: value
+            for key, value in _load_date_cache(cache_path).items()
+            if os.path.dirname(key) != image_dir
+        }
+        cache.update(entries)
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning("Could not write date cache %s: %s", cache_path, e)
+
+
+def _extract_and_format(img_path: str, date_from: str = "auto") -> Tuple[str, str]:
+    """Return (image_path, display date) for one image (process-pool task)."""
+    # Format the datetime directly rather than via a string round trip
+    dt, display_fmt = _extract_datetime(img_path, date_from)
+    return img_path, dt.strftime(display_fmt or _DISPLAY_DT_FMT)
+
+
+def create_date_files(
+    image_dir: str,
+    output_dir: str,
+    date_from: str = "auto",
+    max_workers: Optional[int] = None,
+) -> List[Tuple[str, str]]:
     """Create a list of image files with their dates.
 
     Args:
         image_dir: Directory containing source images
         output_dir: Directory for output files
+        date_from: Date source passed to ``extract_date_time``
+        max_workers: Processes for reading dates (defaults to the CPU count)
 
     Returns:
         List of tuples (image_path, date_string)
@@ -266,33 +665,73 @@ def create_date_files(image_dir: str, output_dir: str) -> List[Tuple[str, str]]:
     4. Returns sorted list of (image_path, date) tuples
     """
     os.makedirs(output_dir, exist_ok=True)
-    image_files = []
-    for ext in ["*.jpg", "*.jpeg", "*.png", "*.tiff", "*.bmp"]:
-        found = glob.glob(os.path.join(image_dir, ext))
-        found.extend(glob.glob(os.path.join(image_dir, ext.upper())))
-        image_files.extend(found)
-
-    image_files.sort()
-
-    date_files = []
+    image_files = _list_images(image_dir)
+
+    # Dates from earlier runs are reused while the file is unchanged, so
+    # re-renders only stat the images
+    cache_path = os.path.join(output_dir, _DATE_CACHE_NAME)
+    cache = _load_date_cache(cache_path)
+    dates = {}
+    stamps = {}
+    # This directory's entries as they should be saved: reused ones now,
+    # fresh ones once extracted
+    entries = {}
+    misses = []
     for img_path in image_files:
-        date_time = extract_date_time(img_path)
-
-        # Ensure we have a valid date string
-        if not date_time:
-            date_time = datetime.now().strftime("%Y:%m:%d %H:%M:%S")
-
-        formatted_date = format_datetime(date_time)
+        key = os.path.abspath(img_path)
+        try:
+            st = os.stat(img_path)
+        except OSError:
+            misses.append(img_path)
+            continue
+        stamp = [st.st_mtime_ns, st.st_size, date_from]
+        cached = cache.get(key)
+        if isinstance(cached, list) and cached[:3] == stamp and len(cached) == 4:
+            dates[img_path] = cached[3]
+            entries[key] = cached
+        else:
+            stamps[key] = stamp
+            misses.append(img_path)
+
+    # Each file is independent, so larger sequences are spread over a process
+    # pool; map() keeps the results in the sorted order of misses.
+    extract = partial(_extract_and_format, date_from=date_from)
+    if len(misses) < _PARALLEL_MIN_IMAGES:
+        extracted = [extract(img_path) for img_path in misses]
+    else:
+        workers = max_workers or os.cpu_count() or 1
+        # About four batches per worker keeps IPC per image low while still
+        # balancing uneven files across the pool
+        chunksize = max(16, len(misses) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            extracted = list(
+                tqdm(
+                    executor.map(extract, misses, chunksize=chunksize),
+                    total=len(misses),
+                    desc="Reading dates",
+                    unit="images",
+                )
+            )
 
-        # Ensure we have a valid formatted date
-        if not formatted_date:
-            formatted_date = datetime.now().strftime("%A, %B %d, %Y %I:%M%p")
+    for img_path, formatted_date in extracted:
+        dates[img_path] = formatted_date
+        key = os.path.abspath(img_path)
+        if key in stamps:
+            entries[key] = stamps[key] + [formatted_date]
 
-        date_files.append((img_path, formatted_date))
+    # Only write when this directory's entries changed: new or re-read
+    # images, or images that have gone since the last run
+    abs_dir = os.path.abspath(image_dir)
+    previous = {
+        key: value for key, value in cache.items() if os.path.dirname(key) == abs_dir
+    }
+    if entries != previous:
+        _save_date_cache(cache_path, image_dir, entries)
 
-    return date_files
+    return [(img_path, dates[img_path]) for img_path in image_files]
 
 
+@lru_cache(maxsize=1)
 def get_system_font() -> str:
     """Get the appropriate system font for the current platform.
 
@@ -320,7 +759,7 @@ def get_system_font() -> str:
         for font_path in font_paths:
             if os.path.exists(font_path):
                 return font_path
-        print("Warning: No monospace font found on macOS, falling back to Courier")
+        logger.warning("No monospace font found on macOS, falling back to Courier")
         return "Courier"
     else:
         font_paths = [
@@ -332,7 +771,7 @@ def get_system_font() -> str:
         for font_path in font_paths:
             if os.path.exists(font_path):
                 return font_path
-        print("Warning: No monospace font found, falling back to Courier")
+        logger.warning("No monospace font found, falling back to Courier")
         return "Courier"
 
 
@@ -370,8 +809,93 @@ def parse_resolution(
         return None, None
 
 
+# Both escaping layers of a concat file_packet_metadata value, in one pass
+_CONCAT_METADATA_ESCAPES = str.maketrans({"\\": "\\\\\\\\", "'": "\\\\\\'", " ": "\\ "})
+# Forward slashes, and quotes closed/escaped/reopened, for a quoted concat path
+_CONCAT_PATH_ESCAPES = str.maketrans({"\\": "/", "'": "'\\''"})
+
+
+def _escape_concat_metadata(value: str) -> str:
+    """Escape a value for a ``file_packet_metadata`` line of a concat list.
+
+    The concat demuxer unquotes the directive once and the metadata parser
+    unescapes ``key=value`` again, so quotes and backslashes are escaped for
+    both layers.
+    """
+    return value.translate(_CONCAT_METADATA_ESCAPES)
+
+
+def _date_concat_list(
+    image_paths: List[str],
+    dates: Optional[List[Optional[str]]],
+    fps: Union[int, float],
+) -> str:
+    """Build an ffmpeg concat list that tags every frame with its date.
+
+    Args:
+        image_paths: Image paths in frame order
+        dates: Display date per frame (None entries show a placeholder)
+        fps: Frames per second, giving each image's duration
+
+    Returns:
+        The list text, meant to be piped to ffmpeg's stdin
+    """
+    duration = f"duration {1.0 / fps:.6f}\n"
+    lines = ["ffconcat version 1.0\n"]
+    for img_path, date_str in zip(image_paths, dates or [None] * len(image_paths)):
+        # The list is read from pipe:, so paths need an explicit file: protocol
+        path = os.path.abspath(img_path).translate(_CONCAT_PATH_ESCAPES)
+        date = _escape_concat_metadata(date_str or "No date available")
+        lines.append(f"file 'file:{path}'\n")
+        lines.append(duration)
+        lines.append(f"file_packet_metadata date={date}\n")
+    return "".join(lines)
+
+
+# Output frame size per crop family; the crop keeps this aspect ratio
+_CROP_TARGETS = {
+    "instagram": (1080, 1920),
+    "hd": (1920, 1080),
+    "uhd": (3840, 2160),
+}
+
+
+def _crop_box(width: int, height: int, crop_type: str) -> Tuple[int, int, int, int]:
+    """Work out the crop for a crop type such as 'hd_keep_top'.
+
+    Args:
+        width: Source width
+        height: Source height
+        crop_type: Crop family ('instagram', 'hd', 'uhd'), optionally followed
+            by '_center', '_keep_top' or '_keep_bottom'
+
+    Returns:
+        (crop width, crop height, x, y); the crop width/height are even. Frames
+        wider than the target lose their sides equally, taller frames lose
+        rows according to the variant.
+    """
+    family, _, variant = crop_type.partition("_")
+    target = _CROP_TARGETS.get(family)
+    if target is None:
+        return width, height, 0, 0
+    target_width, target_height = target
+    if width / height > target_width / target_height:
+        new_width = int(height * target_width / target_height)
+        new_width -= new_width % 2
+        return new_width, height, (width - new_width) // 2, 0
+    new_height = int(width * target_height / target_width)
+    new_height -= new_height % 2
+    if variant == "keep_top":
+        y = 0
+    elif variant == "keep_bottom":
+        y = height - new_height
+    else:  # center
+        y = (height - new_height) // 2
+    return width, new_height, 0, y
+
+
 def create_video_with_overlay(
-    image_date_files: List[Tuple[str, str]],
+    image_date_files: Union[List[Tuple[str, Optional[str]]], List[str]],
     output_file: str,
     fps: Union[int, float] = 30,
     crop_type: Optional[str] = None,
@@ -380,102 +904,55 @@ def create_video_with_overlay(
     max_width: Optional[int] = None,
     max_height: Optional[int] = None,
     progress_callback=None,
+    dates: Optional[List[Optional[str]]] = None,
+    preset: str = "faster",
+    hwaccel: str = "auto",
 ) -> str:
-    """Create a video from image sequence with optional overlay and cropping."""
+    """Create a video from image sequence with optional overlay and cropping.
+
+    ``image_date_files`` is either a list of (image_path, date) tuples or a
+    plain list of image paths. With plain paths, per-frame dates (only used by
+    the date overlay) are passed separately as ``dates``, so callers without
+    dates need not build a tuple per frame.
+
+    Default-quality MP4s use a working hardware H.264 encoder when
+    ``hwaccel`` is "auto" and one is found, otherwise libx264 with ``preset``.
+    """
     if not isinstance(fps, (int, float)) or fps <= 0:
         raise ValueError(f"FPS must be a positive number, but got {fps}")
 
     if not image_date_files:
         raise ValueError("Image sequence list (image_date_files) cannot be empty.")
 
+    if isinstance(image_date_files[0], str):
+        image_paths = image_date_files
+    else:
+        image_paths = [path for path, _ in image_date_files]
+        if dates is None:
+            dates = [date for _, date in image_date_files]
+
     # Create output directory if it doesn't exist
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-    # Get the first image to determine dimensions
-    first_img_path = image_date_files[0][0]
-    with Image.open(first_img_path) as first_img:
-        width, height = first_img.size
+    # Get the first image to determine dimensions; JPEG/PNG headers are read
+    # directly, other formats go through PIL
+    first_img_path = image_paths[0]
+    first_size = _read_image_size(first_img_path)
+    if first_size is None:
+        with Image.open(first_img_path) as first_img:
+            first_size = first_img.size
+    width, height = first_size
+    if _exif_orientation(first_img_path) in _TRANSPOSED_ORIENTATIONS:
+        # ffmpeg applies the EXIF rotation while decoding, so crop and scale
+        # maths must use the displayed size; only the tag is read, no pixels
+        width, height = height, width
 
     # Initialize crop coordinates
     x = y = 0
 
     # Apply cropping if specified
     if crop_type:
-        if crop_type == "instagram":
-            # Instagram crop (1080x1920 - 9:16 aspect ratio)
-            target_width, target_height = 1080, 1920
-            if width / height > target_width / target_height:
-                # Image is wider than 9:16
-                new_width = int(height * target_width / target_height)
-                # Ensure width is even
-                new_width = new_width - (new_width % 2)
-                x = (width - new_width) // 2
-                if crop_type == "instagram_keep_top":
-                    y = 0
-                elif crop_type == "instagram_keep_bottom":
-                    y = height - target_height
-                else:  # center
-                    y = (height - target_height) // 2
-                width = new_width
-            else:
-                # Image is taller than 9:16
-                new_height = int(width * target_height / target_width)
-                # Ensure height is even
-                new_height = new_height - (new_height % 2)
-                y = (height - new_height) // 2
-                if crop_type == "instagram_keep_top":
-                    y = 0
-                elif crop_type == "instagram_keep_bottom":
-                    y = height - new_height
-                else:  # center
-                    y = (height - new_height) // 2
-                height = new_height
-        elif crop_type.startswith("hd_"):
-            # HD crop (1920x1080)
-            target_width, target_height = 1920, 1080
-            if width / height > target_width / target_height:
-                # Image is wider than 16:9
-                new_width = int(height * target_width / target_height)
-                new_width = new_width - (new_width % 2)
-                x = (width - new_width) // 2
-                y = 0  # No vertical crop needed
-                width = new_width
-            else:
-                # Image is taller than 16:9
-                new_height = int(width * target_height / target_width)
-                new_height = new_height - (new_height % 2)
-                if crop_type == "hd_keep_top":
-                    y = 0
-                elif crop_type == "hd_keep_bottom":
-                    y = height - new_height
-                else:  # center
-                    y = (height - new_height) // 2
-                height = new_height
-            # Always scale to 1920x1080 after crop
-            final_hd_scale = True
-        elif crop_type.startswith("uhd_"):
-            # UHD crop (3840x2160)
-            target_width, target_height = 3840, 2160
-            if width / height > target_width / target_height:
-                # Image is wider than 16:9
-                new_width = int(height * target_width / target_height)
-                new_width = new_width - (new_width % 2)
-                x = (width - new_width) // 2
-                y = 0  # No vertical crop needed
-                width = new_width
-            else:
-                # Image is taller than 16:9
-                new_height = int(width * target_height / target_width)
-                new_height = new_height - (new_height % 2)
-                if crop_type == "uhd_keep_top":
-                    y = 0
-                elif crop_type == "uhd_keep_bottom":
-                    y = height - new_height
-                else:  # center
-                    y = (height - new_height) // 2
-                height = new_height
-            # Always scale to 3840x2160 after crop
-            final_uhd_scale = True
+        width, height, x, y = _crop_box(width, height, crop_type)
 
     # Handle max width/height scaling (only when no crop is selected)
     scale_filter = None
@@ -536,19 +1013,48 @@ def create_video_with_overlay(
     if options:
         output_file = f"{base_name}_{'_'.join(options)}{ext}"
 
-    # Build base FFmpeg command
-    base_cmd = [get_ffmpeg_path(), "-y", "-framerate", str(fps)]
-
-    # Add input pattern for image sequence
-    input_dir = os.path.dirname(image_date_files[0][0])
-    first_filename = os.path.basename(image_date_files[0][0])
-    base_name = first_filename.split("_")[0]
-    ext = os.path.splitext(first_filename)[1]
-    seq_part = first_filename.split("_")[1].split(".")[0]
-    num_digits = len(seq_part)
-    pattern = f"{base_name}_%0{num_digits}d{ext}"
-    input_path = os.path.join(input_dir, pattern)
-    base_cmd.extend(["-i", input_path])
+    # Build base FFmpeg command. Every crop/scale/overlay path goes through
+    # -filter_complex, which runs single-threaded unless told otherwise.
+    base_cmd = [
+        get_ffmpeg_path(),
+        "-y",
+        "-filter_complex_threads",
+        str(os.cpu_count() or 4),
+    ]
+    concat_list = None
+
+    if overlay_type == "date":
+        # The date overlay reads the images through a concat list that tags
+        # every frame with its date, so one drawtext can print them all. The
+        # list goes to ffmpeg's stdin rather than a temp file.
+        concat_list = _date_concat_list(image_paths, dates, fps)
+        base_cmd.extend(
+            [
+                "-protocol_whitelist",
+                "file,pipe",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                # Without an input rate the JPEG stream gets a 1/25 time base,
+                # and durations rounded to it make -r drop or repeat frames
+                "-r",
+                str(fps),
+                "-i",
+                "pipe:0",
+            ]
+        )
+    else:
+        # Add input pattern for image sequence
+        input_dir = os.path.dirname(image_paths[0])
+        first_filename = os.path.basename(image_paths[0])
+        base_name = first_filename.split("_")[0]
+        ext = os.path.splitext(first_filename)[1]
+        seq_part = first_filename.split("_")[1].split(".")[0]
+        num_digits = len(seq_part)
+        pattern = f"{base_name}_%0{num_digits}d{ext}"
+        input_path = os.path.join(input_dir, pattern)
+        base_cmd.extend(["-framerate", str(fps), "-i", input_path])
 
     # Build filter chain
     filter_chain = []
@@ -565,26 +1071,25 @@ def create_video_with_overlay(
         # Calculate box padding (15% of font size)
         box_padding = int(font_size * 0.25)
 
-        ffmpeg_font_path = font_path.replace("\\", "/")
+        # get_system_font returns a family name ("Courier New" on Windows,
+        # "Courier" as the fallback) when no font file was found
+        if os.path.isfile(font_path):
+            ffmpeg_font_path = font_path.replace("\\", "/")
+            font_opt = f"fontfile='{ffmpeg_font_path}'"
+        else:
+            font_opt = f"font='{font_path}'"
+
+        # Font and box options shared by both overlays, and the 5% margins
+        # used to place them; all fixed for the whole render
+        drawtext_style = (
+            f"{font_opt}:fontsize={font_size}"
+            f":fontcolor=white"
+            f":box=1:boxcolor=black@0.5:boxborderw={box_padding}"
+        )
+        margin_x = int(width * 0.05)
+        margin_y = int(height * 0.05)
 
         if overlay_type == "date":
-            temp_dir = tempfile.mkdtemp()
-
-            num_frames = len(image_date_files)
-            num_digits_for_frame_files = (
-                len(str(num_frames - 1)) if num_frames > 0 else 1
-            )
-
-            # Generate one text file per frame and store their paths
-            frame_date_file_paths = []
-            for i, (_, date_str) in enumerate(image_date_files):
-                frame_date_filename = f"date_{i:0{num_digits_for_frame_files}d}.txt"
-                full_frame_date_path = os.path.join(temp_dir, frame_date_filename)
-                content = date_str if date_str else "No date available"
-                with open(full_frame_date_path, "w", encoding="utf-8") as f:
-                    f.write(content)
-                frame_date_file_paths.append(full_frame_date_path.replace("\\", "/"))
-
             filter_parts = []
             current_input_stream = "[0:v]"
             if crop_type:
@@ -597,81 +1102,37 @@ def create_video_with_overlay(
                 filter_parts.append(f"[0:v]{scale_filter}[v_scaled_pre]")
                 current_input_stream = "[v_scaled_pre]"
 
-            # Chain drawtext filters, one for each frame
-            for i in range(num_frames):
-                textfile_for_this_frame = frame_date_file_paths[i]
-                output_stream_label = f"[v{i}]" if i < num_frames - 1 else "[v_out]"
-
-                drawtext_filter = (
-                    f"{current_input_stream}"
-                    f"drawtext=textfile='{textfile_for_this_frame}'"
-                    f":fontfile='{ffmpeg_font_path}'"
-                    f":fontsize={font_size}"
-                    f":fontcolor=white"
-                    f":box=1"
-                    f":boxcolor=black@0.5"
-                    f":boxborderw={box_padding}"
-                    f":x=(w-text_w-{int(width*0.05)})"
-                    f":y=(h-text_h-{int(height*0.05)})"
-                    f":enable='eq(n,{i})'"
-                    f"{output_stream_label}"
-                )
-                filter_parts.append(drawtext_filter)
-                current_input_stream = output_stream_label
-
-            if not filter_parts:
-                if current_input_stream == "[0:v]":
-                    base_cmd.extend(["-map", "0:v"])
-                else:
-                    base_cmd.extend(
-                        ["-filter_complex", f"{current_input_stream}[v_out]"]
-                    )
-                    base_cmd.extend(["-map", "[v_out]"])
-            elif num_frames == 0:
-                base_cmd.extend(
-                    [
-                        "-map",
-                        (
-                            current_input_stream.replace("[", "[").replace("]", "")
-                            if crop_type
-                            else "0:v"
-                        ),
-                    ]
-                )
+            # A single drawtext prints each frame's date from the packet
+            # metadata set in the concat list
+            filter_parts.append(
+                f"{current_input_stream}"
+                f"drawtext=text='%{{metadata\\:date}}'"
+                f":{drawtext_style}"
+                f":x=(w-text_w-{margin_x})"
+                f":y=(h-text_h-{margin_y})"
+                f"[v_out]"
+            )
+            filter_complex = ";".join(filter_parts)
+            # If HD/UHD, append a final scale filter to [v_out] -> [final_out]
+            # (with max width/height, scale_filter already ran before drawtext)
+            if crop_type and crop_type.startswith("hd_"):
+                filter_complex += ";[v_out]scale=1920:1080[final_out]"
+                base_cmd.extend(["-filter_complex", filter_complex])
+                base_cmd.extend(["-map", "[final_out]"])
+            elif crop_type and crop_type.startswith("uhd_"):
+                filter_complex += ";[v_out]scale=3840:2160[final_out]"
+                base_cmd.extend(["-filter_complex", filter_complex])
+                base_cmd.extend(["-map", "[final_out]"])
             else:
-                filter_complex = ";".join(filter_parts)
-                # If HD/UHD, append a final scale filter to [v_out] -> [final_out]
-                if crop_type and crop_type.startswith("hd_"):
-                    filter_complex += ";[v_out]scale=1920:1080[final_out]"
-                    base_cmd.extend(["-filter_complex", filter_complex])
-                    base_cmd.extend(["-map", "[final_out]"])
-                elif crop_type and crop_type.startswith("uhd_"):
-                    filter_complex += ";[v_out]scale=3840:2160[final_out]"
-                    base_cmd.extend(["-filter_complex", filter_complex])
-                    base_cmd.extend(["-map", "[final_out]"])
-                else:
-                    if scale_filter:
-                        # scale_filter was already applied before drawtext (see above).
-                        base_cmd.extend(["-filter_complex", filter_complex])
-                        base_cmd.extend(["-map", "[v_out]"])
-                    else:
-                        base_cmd.extend(["-filter_complex", filter_complex])
-                        base_cmd.extend(["-map", "[v_out]"])
-
-            def cleanup():
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception:
-                    pass
-
-            atexit.register(cleanup)
+                base_cmd.extend(["-filter_complex", filter_complex])
+                base_cmd.extend(["-map", "[v_out]"])
 
             overlay_applied = True
 
         elif overlay_type == "frame":
             # Single drawtext with dynamic frame index (avoids megabyte-long filter graphs
             # and argv limits from one drawtext per frame).
-            num_frames = len(image_date_files)
+            num_frames = len(image_paths)
             filter_parts = []
             current_input_stream = "[0:v]"
             if crop_type:
@@ -695,12 +1156,9 @@ def create_video_with_overlay(
                     scaled_before_drawtext = True
                 filter_parts.append(
                     f"{draw_src}drawtext=text='{frame_text}'"
-                    f":fontfile='{ffmpeg_font_path}'"
-                    f":fontsize={font_size}"
-                    f":fontcolor=white"
-                    f":box=1:boxcolor=black@0.5:boxborderw={box_padding}"
+                    f":{drawtext_style}"
                     f":x=(w-text_w)/2"
-                    f":y={int(height * 0.05)}"
+                    f":y={margin_y}"
                     f":fix_bounds=true[v_out]"
                 )
 
@@ -784,91 +1242,125 @@ def create_video_with_overlay(
         )
     elif quality != "gif":
         # Default MP4 with good quality
-        base_cmd.extend(
-            ["-c:v", "libx264", "-preset", "slow", "-crf", "18", "-pix_fmt", "yuv420p"]
-        )
+        encoder = detect_hw_encoder() if hwaccel == "auto" else "libx264"
+        if encoder != "libx264":
+            base_cmd.extend(hw_encoder_args(encoder))
+        else:
+            base_cmd.extend(
+                [
+                    "-c:v",
+                    "libx264",
+                    "-preset",
+                    preset,
+                    "-crf",
+                    "18",
+                    "-pix_fmt",
+                    "yuv420p",
+                ]
+            )
+
+    # Let the encoder pick its own thread count for the available cores
+    base_cmd.extend(["-threads", "0"])
+
+    if overlay_type == "date":
+        # Keep the output constant frame rate and stop at the last image
+        # rather than on the rounded duration of the final entry
+        base_cmd.extend(["-r", str(fps), "-frames:v", str(len(image_paths))])
+
+    # Machine-readable progress on stdout (key=value lines) instead of
+    # scraping the status line from stderr
+    base_cmd.extend(["-progress", "pipe:1", "-nostats"])
 
     # Add output file
     base_cmd.append(output_file)
 
     # Run ffmpeg command
-    try:
-        # Calculate total frames for progress bar
-        total_frames = len(image_date_files)
-        duration = total_frames / fps
-
-        # Create progress bar
-        with tqdm(total=total_frames, desc="Rendering", unit="frames") as pbar:
-            # Run ffmpeg with progress monitoring
-            process = subprocess.Popen(
-                base_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-            )
-
-            # readline() consumes stderr; keep a tail so failures still show FFmpeg errors
-            stderr_buf: deque[str] = deque(maxlen=2500)
-
-            # Monitor FFmpeg output for progress
-            while True:
-                output = process.stderr.readline()
-                if output == "" and process.poll() is not None:
-                    break
-                if output:
-                    stderr_buf.append(output)
-                    # Look for frame number in FFmpeg output
-                    if "frame=" in output:
-                        try:
-                            frame = int(output.split("frame=")[1].split()[0])
-                            pbar.n = frame
-                            pbar.refresh()
-                            if progress_callback:
-                                progress_callback(frame, total_frames)
-                        except (IndexError, ValueError):
-                            pass
-
-            # Get the return code
-            return_code = process.wait()
-
-            if return_code != 0:
-                error_output = "".join(stderr_buf)
-                if not error_output.strip():
-                    error_output = process.stderr.read()
-                msg = _ffmpeg_failure_message(return_code, error_output, base_cmd)
-                print(msg)
-                raise RuntimeError(msg)
-
-    except RuntimeError:
-        raise
+    total_frames = len(image_paths)
+    with (
+        tqdm(total=total_frames, desc="Rendering", unit="frames") as pbar,
+        tempfile.TemporaryFile() as stderr_file,
+    ):
+        # stderr only matters if ffmpeg fails, so it goes to a file rather
+        # than being read line by line
+        process = subprocess.Popen(
+            base_cmd,
+            stdin=subprocess.PIPE if concat_list else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+        )
+        if concat_list:
+            # ffmpeg reads the whole list while opening the input, before it
+            # writes any progress, so this cannot deadlock on stdout
+            try:
+                process.stdin.write(concat_list.encode("utf-8"))
+                process.stdin.close()
+            except BrokenPipeError:
+                pass  # ffmpeg exited early; its stderr explains why
+
+        for line in process.stdout:
+            if line.startswith(b"frame="):
+                value = line[6:].strip()
+                if value.isdigit():
+                    frame = int(value)
+                    pbar.update(frame - pbar.n)
+                    if progress_callback:
+                        progress_callback(frame, total_frames)
+
+        return_code = process.wait()
+        if return_code != 0:
+            stderr_file.seek(0)
+            error_output = stderr_file.read().decode("utf-8", errors="replace")
+            msg = _ffmpeg_failure_message(return_code, error_output, base_cmd)
+            logger.error("%s", msg)
+            raise RuntimeError(msg)
 
     return output_file
 
 
-def find_image_directories(root_dir: str) -> List[str]:
+def find_image_directories(root_dir: str) -> Iterator[str]:
     """Find all directories containing image files.
 
     Args:
         root_dir (str): Root directory to search in
 
-    Returns:
-        list: List of directory paths containing images
+    Yields:
+        str: Each directory path containing images, as soon as it is found
 
     The function:
     1. Walks through directory tree
     2. Checks for common image file extensions
-    3. Returns list of directories containing images
+    3. Yields directories containing images, so callers can start on the
+       first one before the rest of a large tree has been walked
     4. Skips hidden directories and files
     """
-    image_extensions = {".jpg", ".jpeg", ".png", ".tiff", ".bmp"}
-    dirs_with_images = []
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
-        has_images = any(
-            any(f.lower().endswith(ext) for ext in image_extensions)
-            for f in filenames
-            if not f.startswith(".")
-        )
+    # Walk with scandir directly: each entry's type comes from the directory
+    # listing, and once one image is seen the remaining names only need the
+    # directory check. Same top-down order as os.walk, symlinked directories
+    # are not followed and unreadable directories are skipped.
+    pending = [root_dir]
+    while pending:
+        dirpath = pending.pop()
+        subdirs = []
+        has_images = False
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("."):
+                        continue
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif not has_images:
+                        # One set lookup instead of an endswith() per extension
+                        _, dot, ext = name.rpartition(".")
+                        has_images = bool(dot) and ext.lower() in _IMAGE_EXTS
+        except OSError:
+            continue
         if has_images:
-            dirs_with_images.append(dirpath)
-    return dirs_with_images
+            yield dirpath
+        pending.extend(reversed(subdirs))
@@ -12,15 +12,26 @@ allowing users to:
 """
 
 import os
+import platform
 import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from typing import Optional, Dict, Any, List, Tuple
-from .core import create_video_with_overlay, find_image_directories, create_date_files
+from typing import Callable, Optional, Dict, Any, List, Tuple
+from .core import (
+    _is_contiguous,
+    _list_images,
+    _output_names,
+    create_video_with_overlay,
+    find_image_directories,
+    create_date_files,
+)
 from sisr.utils import get_ffmpeg_path, resource_path
 from sisr.preferences import load_prefs, save_prefs
+import queue
 import threading
-import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import itemgetter
 from collections import defaultdict
 
 # Crop dropdown: (label shown in UI, internal key)
@@ -48,6 +59,42 @@ POSITION_LABEL_TO_API: Dict[str, str] = {
 }
 POSITION_DISPLAY_VALUES: Tuple[str, ...] = ("", "Center", "Keep top", "Keep bottom")
 
+# Quality dropdown: label -> create_video_with_overlay quality key
+QUALITY_LABEL_TO_KEY: Dict[str, str] = {
+    "Default": "default",
+    "ProRes": "prores",
+    "ProRes HQ": "proreshq",
+    "GIF": "gif",
+}
+QUALITY_DISPLAY_VALUES: Tuple[str, ...] = tuple(QUALITY_LABEL_TO_KEY)
+
+# How often the main thread applies UI updates queued by worker threads
+UI_POLL_MS = 50
+
+
+def _split_frame_name(name: str) -> Optional[Tuple[str, str, str]]:
+    """Split a sequentially named image into (prefix, frame number, extension).
+
+    Scans back from the extension over the digit run, which is what
+    ``^(.*?)(\\d+)(\\.[^.]+)$`` matches, without running a regex per file.
+
+    Args:
+        name: Image file name, e.g. ``img_0001.jpg``
+
+    Returns:
+        Tuple such as ``("img_", "0001", ".jpg")``, or None if the name has no
+        number directly before its extension
+    """
+    dot = name.rfind(".")
+    if dot <= 0 or dot == len(name) - 1:
+        return None
+    start = dot
+    while start > 0 and name[start - 1].isdecimal():
+        start -= 1
+    if start == dot:
+        return None
+    return name[:start], name[start:dot], name[dot:]
+
 
 class SISRGUI:
     """Main GUI class for the Simple Image Sequence Renderer."""
@@ -62,30 +109,30 @@ class SISRGUI:
         self.icon_img = None
         _icns = resource_path("icon.icns")
         _png = resource_path("icons", "icon_128x128.png")
+        # The .icns bitmap is only used on macOS; elsewhere the PNG is the icon
+        use_icns = platform.system() == "Darwin" and os.path.isfile(_icns)
         try:
-            import platform
-
-            if platform.system() == "Darwin" and os.path.isfile(_icns):
+            if use_icns:
                 self.root.iconbitmap(_icns)
             if os.path.isfile(_png):
                 self.icon_img = tk.PhotoImage(file=_png)
-                if platform.system() != "Darwin" or not os.path.isfile(_icns):
+                if not use_icns:
                     self.root.iconphoto(True, self.icon_img)
         except Exception as e:
             print(f"Warning: Could not set app icon: {e}")
 
-        # Create a hidden Toplevel for messageboxes with the app icon
-        self.msgbox_parent = tk.Toplevel(self.root)
-        self.msgbox_parent.withdraw()
-        try:
-            import platform
-
-            if platform.system() == "Darwin" and os.path.isfile(_icns):
+        # Message boxes need a parent carrying the app icon. iconphoto(True, ...)
+        # above already makes the PNG the default for every window, so only the
+        # macOS .icns bitmap needs a hidden Toplevel of its own.
+        if use_icns:
+            self.msgbox_parent = tk.Toplevel(self.root)
+            self.msgbox_parent.withdraw()
+            try:
                 self.msgbox_parent.iconbitmap(_icns)
-            elif self.icon_img:
-                self.msgbox_parent.iconphoto(True, self.icon_img)
-        except Exception as e:
-            print(f"Warning: Could not set msgbox icon: {e}")
+            except Exception as e:
+                print(f"Warning: Could not set msgbox icon: {e}")
+        else:
+            self.msgbox_parent = self.root
 
         # Set theme colors
         self.bg_color = "#1a1a1a"  # Dark background
@@ -111,6 +158,11 @@ class SISRGUI:
         self.input_dir_var = tk.StringVar(value=self.input_dir or "")
         self.output_dir_var = tk.StringVar(value=self.output_dir or "")
 
+        # Worker threads hand UI updates to the Tk main thread through this
+        # queue; Tk objects are only touched from the main thread
+        self._ui_queue: queue.Queue = queue.Queue()
+        self.root.after(UI_POLL_MS, self._drain_ui_queue)
+
         # Create title
         self.create_title()
 
@@ -332,7 +384,7 @@ class SISRGUI:
             options_frame,
             textvariable=self.quality_var,
             state="readonly",
-            values=("Default", "ProRes", "ProRes HQ", "GIF"),
+            values=QUALITY_DISPLAY_VALUES,
             font=("Helvetica", 11),
         )
         self.quality_combo.grid(row=1, column=2, sticky=(tk.W, tk.E))
@@ -446,10 +498,25 @@ class SISRGUI:
             self.input_dir = dir_path
             self.prefs["input_dir"] = dir_path
             save_prefs(self.prefs)
-            if not find_image_directories(dir_path):
-                messagebox.showwarning(
-                    "Warning", "No image files found in selected directory"
-                )
+            # A tree without images is walked to the end, which can take a
+            # while on network shares, so check it off the Tk main thread
+            threading.Thread(
+                target=self._scan_input_dir, args=(dir_path,), daemon=True
+            ).start()
+
+    def _scan_input_dir(self, dir_path: str) -> None:
+        """Check a newly selected input directory for images (worker thread)."""
+        has_images = next(find_image_directories(dir_path), None) is not None
+        self._post(self._on_input_scanned, dir_path, has_images)
+
+    def _on_input_scanned(self, dir_path: str, has_images: bool) -> None:
+        """Report the input directory check back on the Tk main thread."""
+        if dir_path != self.input_dir:
+            return  # another directory was picked meanwhile
+        if not has_images:
+            messagebox.showwarning(
+                "Warning", "No image files found in selected directory"
+            )
 
     def select_output_dir(self) -> None:
         """Handle output directory selection."""
@@ -542,13 +609,7 @@ class SISRGUI:
 
     def get_quality(self) -> str:
         """Get the selected quality setting."""
-        quality_map = {
-            "Default": "default",
-            "ProRes": "prores",
-            "ProRes HQ": "proreshq",
-            "GIF": "gif",
-        }
-        return quality_map.get(self.quality_var.get(), "default")
+        return QUALITY_LABEL_TO_KEY.get(self.quality_var.get(), "default")
 
     def get_max_width(self) -> Optional[int]:
         """Get the max width value."""
@@ -586,8 +647,18 @@ class SISRGUI:
                 "Error", "Please select both input and output directories"
             )
             return
+        # Tk variables may only be read on the main thread, so capture every
+        # setting here and hand plain values to the worker.
         try:
             fps = self.get_fps()
+            settings = {
+                "fps": fps,
+                "crop_type": self.get_crop_type(),
+                "overlay_type": self.get_overlay_type(),
+                "quality": self.get_quality(),
+                "max_width": self.get_max_width(),
+                "max_height": self.get_max_height(),
+            }
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return
@@ -596,107 +667,59 @@ class SISRGUI:
         self.start_button.state(["disabled"])
         self.progress_var.set(0)
         self.status_var.set("Starting rendering...")
-        self.root.update()
-        threading.Thread(target=self._render_worker, daemon=True).start()
-
-    def _render_worker(self):
+        threading.Thread(
+            target=self._render_worker,
+            args=(self.input_dir, self.output_dir, settings),
+            daemon=True,
+        ).start()
+
+    def _render_worker(
+        self, input_dir: str, output_dir: str, settings: Dict[str, Any]
+    ) -> None:
+        """Render every image directory under input_dir off the Tk main thread.
+
+        Args:
+            input_dir: Directory searched for image sequences
+            output_dir: Directory for the rendered videos
+            settings: Render options captured by start_render on the main thread
+        """
         try:
-            crop_type = self.get_crop_type()
-            overlay_type = self.get_overlay_type()
-            quality = self.get_quality()
-            fps = self.get_fps()
-            image_dirs = find_image_directories(self.input_dir)
+            image_dirs = list(find_image_directories(input_dir))
             if not image_dirs:
                 self._show_error("No image directories found")
                 return
-            for dir_path in image_dirs:
-                dir_name = os.path.basename(dir_path)
-                output_file = os.path.join(self.output_dir, f"{dir_name}.mp4")
-                if overlay_type == "date":
-                    image_date_files = create_date_files(dir_path, self.output_dir)
-                else:
-                    image_files = [
-                        f
-                        for f in sorted(os.listdir(dir_path))
-                        if not f.startswith(".")
-                        and f.lower().endswith(
-                            (".jpg", ".jpeg", ".png", ".tiff", ".bmp")
-                        )
-                    ]
-                    image_date_files = [
-                        (os.path.join(dir_path, f), None) for f in image_files
-                    ]
-                if not image_date_files:
-                    continue
-                # Improved check for sequentially named images
-                seq_pattern = re.compile(r"^(.*?)(\d+)(\.[^.]+)$")
-                matches = [
-                    seq_pattern.match(os.path.basename(img_path))
-                    for img_path, _ in image_date_files
-                ]
-                valid_matches = [m for m in matches if m]
-                if not valid_matches:
-                    self.root.after(
-                        0,
-                        lambda: messagebox.showerror(
-                            "Error",
-                            f"The directory '{dir_name}' does not contain a sequentially named image sequence. Please ensure your images are named in order (e.g., img_0001.jpg, img_0002.jpg, ...).",
-                            parent=self.msgbox_parent,
-                        ),
-                    )
-                    self._set_status(
-                        f"Error: Non-sequential image names in {dir_name}."
-                    )
-                    continue
-                # Group by prefix and extension
-                groups = defaultdict(list)
-                for m in valid_matches:
-                    prefix, num, ext = m.group(1), m.group(2), m.group(3)
-                    groups[(prefix, len(num), ext)].append(int(num))
-                found_sequence = False
-                for (prefix, pad, ext), nums in groups.items():
-                    nums.sort()
-                    if nums == list(range(nums[0], nums[0] + len(nums))):
-                        found_sequence = True
-                        break
-                if not found_sequence:
-                    self.root.after(
-                        0,
-                        lambda: messagebox.showerror(
-                            "Error",
-                            f"The directory '{dir_name}' does not contain a sequentially named image sequence. Please ensure your images are named in order (e.g., img_0001.jpg, img_0002.jpg, ...).",
-                            parent=self.msgbox_parent,
-                        ),
-                    )
-                    self._set_status(
-                        f"Error: Non-sequential image names in {dir_name}."
-                    )
-                    continue
-                self._set_status(f"Processing {dir_name}...")
-
-                def progress_callback(frame, total):
-                    percent = (frame / total) * 100 if total else 0
-                    self.root.after(0, self.progress_var.set, percent)
-                    self.root.after(
-                        0,
-                        self.status_var.set,
-                        f"Processing {dir_name}... {percent:.1f}%",
+            # Fraction of each directory's frames rendered; the bar shows their
+            # mean so it covers the whole run
+            done = [0.0] * len(image_dirs)
+            # Each render is an ffmpeg subprocess, so threads are enough to run
+            # several at once. ffmpeg already spreads one encode over several
+            # cores, so only machines with cores to spare run directories side
+            # by side.
+            cpus = os.cpu_count() or 1
+            jobs = min(len(image_dirs), max(1, cpus // 4))
+            render = partial(
+                self._render_directory,
+                output_dir=output_dir,
+                settings=settings,
+                done=done,
+                # Renders side by side share the cores for reading dates
+                date_workers=max(1, cpus // jobs),
+            )
+            names = _output_names(input_dir, image_dirs)
+            if jobs > 1:
+                executor = ThreadPoolExecutor(max_workers=jobs)
+                try:
+                    list(
+                        executor.map(render, range(len(image_dirs)), image_dirs, names)
                     )
-
-                create_video_with_overlay(
-                    image_date_files=image_date_files,
-                    output_file=output_file,
-                    fps=fps,
-                    crop_type=crop_type,
-                    overlay_type=overlay_type,
-                    quality=quality,
-                    max_width=self.get_max_width(),
-                    max_height=self.get_max_height(),
-                    progress_callback=progress_callback,
-                )
+                finally:
+                    # Don't start queued directories after a failed render
+                    executor.shutdown(cancel_futures=True)
+            else:
+                for index, (dir_path, name) in enumerate(zip(image_dirs, names)):
+                    render(index, dir_path, name)
             self._set_status("Rendering completed successfully")
-            self.root.after(
-                0,
+            self._post(
                 lambda: messagebox.showinfo(
                     "Success",
                     "Video rendering completed successfully",
@@ -706,23 +729,150 @@ class SISRGUI:
         except Exception as e:
             error_msg = str(e)
             self._set_status("Error during rendering")
-            self.root.after(
-                0,
+            self._post(
                 lambda: messagebox.showerror(
                     "Error", error_msg, parent=self.msgbox_parent
                 ),
             )
         finally:
-            self.root.after(0, lambda: self.start_button.state(["!disabled"]))
-            self.root.after(0, self.progress_var.set, 0)
+            self._post(lambda: self.start_button.state(["!disabled"]))
+            self._post(self.progress_var.set, 0)
+
+    def _render_directory(
+        self,
+        index: int,
+        dir_path: str,
+        output_name: str,
+        output_dir: str,
+        settings: Dict[str, Any],
+        done: List[float],
+        date_workers: Optional[int] = None,
+    ) -> None:
+        """Render one image directory; called from the render worker's threads.
+
+        Args:
+            index: Position of dir_path among the discovered directories
+            dir_path: Directory containing the image sequence
+            output_name: Video file name without extension, from _output_names
+            output_dir: Directory for the rendered video
+            settings: Render options captured by start_render on the main thread
+            done: Per-directory fraction of frames rendered, shared by the run
+            date_workers: Processes for reading dates (defaults to the CPU count)
+        """
+        overlay_type = settings["overlay_type"]
+        dir_name = os.path.basename(dir_path)
+        if len(done) > 1:
+            # Name which of the discovered sequences is rendering
+            label = f"{output_name} ({index + 1}/{len(done)})"
+        else:
+            label = output_name
+        output_file = os.path.join(output_dir, f"{output_name}.mp4")
+        if overlay_type == "date":
+            image_date_files = create_date_files(
+                dir_path, output_dir, max_workers=date_workers
+            )
+        else:
+            image_date_files = [(path, None) for path in _list_images(dir_path)]
+        if not image_date_files:
+            self._set_done(done, index, 1.0)
+            return
+        # Improved check for sequentially named images: group the frame
+        # numbers by prefix, padding and extension in one pass over the names
+        groups = defaultdict(list)
+        keyed = []
+        for frame in image_date_files:
+            name = os.path.basename(frame[0])
+            parts = _split_frame_name(name)
+            if parts:
+                prefix, number, ext = parts
+                n = int(number)
+                groups[(prefix, len(number), ext)].append(n)
+                keyed.append(((prefix, len(number), ext, n), frame))
+            else:
+                # Images without a frame number stay in, placed by name
+                keyed.append(((name, 0, "", 0), frame))
+        if not any(_is_contiguous(nums) for nums in groups.values()):
+            self._post(
+                lambda: messagebox.showerror(
+                    "Error",
+                    f"The directory '{dir_name}' does not contain a sequentially named image sequence. Please ensure your images are named in order (e.g., img_0001.jpg, img_0002.jpg, ...).",
+                    parent=self.msgbox_parent,
+                ),
+            )
+            self._set_status(f"Error: Non-sequential image names in {dir_name}.")
+            self._set_done(done, index, 1.0)
+            return
+        # The date overlay's concat list plays frames in list order: each
+        # sequence in frame-number order (unpadded names such as img_1 ...
+        # img_12 sort as text otherwise), one sequence after another
+        keyed.sort(key=itemgetter(0))
+        image_date_files = [frame for _, frame in keyed]
+        self._set_status(f"Processing {label}...")
+
+        def progress_callback(frame, total):
+            percent = (frame / total) * 100 if total else 0
+            self._set_done(
+                done, index, percent / 100, f"Processing {label}... {percent:.1f}%"
+            )
+
+        create_video_with_overlay(
+            image_date_files=image_date_files,
+            output_file=output_file,
+            fps=settings["fps"],
+            crop_type=settings["crop_type"],
+            overlay_type=overlay_type,
+            quality=settings["quality"],
+            max_width=settings["max_width"],
+            max_height=settings["max_height"],
+            progress_callback=progress_callback,
+        )
+        self._set_done(done, index, 1.0)
+
+    def _set_done(
+        self,
+        done: List[float],
+        index: int,
+        fraction: float,
+        status: Optional[str] = None,
+    ) -> None:
+        """Record one directory's progress and show the run's overall progress.
+
+        The bar and the optional status text are updated by a single Tk event.
+        """
+        done[index] = fraction
+        self._post(self._show_progress, 100 * sum(done) / len(done), status)
+
+    def _show_progress(self, percent: float, status: Optional[str]) -> None:
+        """Apply a progress update on the Tk main thread."""
+        self.progress_var.set(percent)
+        if status is not None:
+            self.status_var.set(status)
+
+    def _post(self, func: Callable[..., Any], *args: Any) -> None:
+        """Queue func(*args) to run on the Tk main thread (any thread)."""
+        self._ui_queue.put((func, args))
+
+    def _drain_ui_queue(self) -> None:
+        """Run the callbacks queued by worker threads.
+
+        The next poll is scheduled first, so updates keep flowing while a
+        queued message box runs its own event loop.
+        """
+        self.root.after(UI_POLL_MS, self._drain_ui_queue)
+        while True:
+            try:
+                func, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            func(*args)
 
     def _set_status(self, text):
-        self.root.after(0, self.status_var.set, text)
+        self._post(self.status_var.set, text)
 
     def _show_error(self, text):
         self._set_status(text)
-        self.root.after(
-            0, lambda: messagebox.showerror("Error", text, parent=self.msgbox_parent)
+        self._post(
+            lambda: messagebox.showerror("Error", text, parent=self.msgbox_parent)
         )
 
 
@@ -3,14 +3,51 @@ import json
 
 PREFS_PATH = os.path.expanduser("~/.sisr_prefs.json")
 
+# Last preferences read or written: (path, mtime_ns, size, prefs). Reused
+# while the file on disk is unchanged, so unchanged prefs are not rewritten.
+_cache = None
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _cached(path):
+    stamp = _file_stamp(path)
+    if _cache is not None and stamp is not None and _cache[:3] == (path, *stamp):
+        return _cache[3]
+    return None
+
+
+def _remember(path, prefs):
+    global _cache
+    stamp = _file_stamp(path)
+    _cache = (path, *stamp, dict(prefs)) if stamp else None
+
 
 def load_prefs():
+    cached = _cached(PREFS_PATH)
+    if cached is not None:
+        return dict(cached)
     if os.path.exists(PREFS_PATH):
         with open(PREFS_PATH, "r") as f:
-            return json.load(f)
+            prefs = json.load(f)
+        _remember(PREFS_PATH, prefs)
+        return prefs
     return {}
 
 
 def save_prefs(prefs):
-    with open(PREFS_PATH, "w") as f:
-        json.dump(prefs, f)
+    if _cached(PREFS_PATH) == prefs:
+        return
+    # Write a temporary file and rename it over the old one, so a crash
+    # mid-write cannot leave a truncated prefs file behind
+    tmp_path = f"{PREFS_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(prefs, f, separators=(",", ":"))
+    os.replace(tmp_path, PREFS_PATH)
+    _remember(PREFS_PATH, prefs)
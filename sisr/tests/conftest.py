@@ -1,12 +1,35 @@
 import os
+import shutil
 import tempfile
 from pathlib import Path
 import pytest
-from PIL import Image
-import piexif
+from PIL import ExifTags, Image
 from datetime import datetime
 
 
+def _exif_now():
+    """EXIF block whose DateTimeOriginal is the current time."""
+    exif = Image.Exif()
+    exif.get_ifd(ExifTags.IFD.Exif)[
+        ExifTags.Base.DateTimeOriginal
+    ] = datetime.now().strftime("%Y:%m:%d %H:%M:%S")
+    return exif
+
+
+def _save_white_image(img_path, size):
+    """Save a white JPEG with EXIF data, atomically.
+
+    The images live in the shared test data directory, so with pytest-xdist
+    several workers may create the same file at once; each writes its own
+    temporary file and renames it into place.
+    """
+    img = Image.new("RGB", size, color="white")
+    tmp_path = img_path.with_name(f"{img_path.name}.{os.getpid()}.tmp")
+    # Add EXIF data with date
+    img.save(tmp_path, format="JPEG", quality=95, exif=_exif_now())
+    os.replace(tmp_path, img_path)
+
+
 @pytest.fixture(scope="session")
 def test_data_dir():
     """Return the path to the test data directory."""
@@ -26,18 +49,7 @@ def white_image_1920x1080(test_images_dir):
     """Create a 1920x1080 white test image with EXIF data."""
     img_path = test_images_dir / "white_1920x1080.jpg"
     if not img_path.exists():
-        img = Image.new("RGB", (1920, 1080), color="white")
-        # Add EXIF data with date
-        exif_dict = {
-            "0th": {},
-            "Exif": {
-                piexif.ExifIFD.DateTimeOriginal: datetime.now()
-                .strftime("%Y:%m:%d %H:%M:%S")
-                .encode("utf-8")
-            },
-        }
-        exif_bytes = piexif.dump(exif_dict)
-        img.save(img_path, quality=95, exif=exif_bytes)
+        _save_white_image(img_path, (1920, 1080))
     return str(img_path)
 
 
@@ -46,18 +58,7 @@ def white_image_1080x1920(test_images_dir):
     """Create a 1080x1920 white test image with EXIF data."""
     img_path = test_images_dir / "white_1080x1920.jpg"
     if not img_path.exists():
-        img = Image.new("RGB", (1080, 1920), color="white")
-        # Add EXIF data with date
-        exif_dict = {
-            "0th": {},
-            "Exif": {
-                piexif.ExifIFD.DateTimeOriginal: datetime.now()
-                .strftime("%Y:%m:%d %H:%M:%S")
-                .encode("utf-8")
-            },
-        }
-        exif_bytes = piexif.dump(exif_dict)
-        img.save(img_path, quality=95, exif=exif_bytes)
+        _save_white_image(img_path, (1080, 1920))
     return str(img_path)
 
 
@@ -68,24 +69,27 @@ def temp_dir():
         yield tmpdir
 
 
-@pytest.fixture
-def image_sequence(temp_dir, white_image_1920x1080):
-    """Create a sequence of 3 white test images with EXIF data."""
+@pytest.fixture(scope="session")
+def image_sequence(tmp_path_factory, white_image_1920x1080):
+    """Create a sequence of 3 white test images with EXIF data.
+
+    Shared by the whole session, so tests must treat it as read-only and
+    write their output elsewhere (see ``output_dir``).
+    """
+    sequence_dir = tmp_path_factory.mktemp("sequence")
     sequence = []
     for i in range(3):
-        img_path = os.path.join(temp_dir, f"test_{i:03d}.jpg")
-        # Create a new image with EXIF data
-        img = Image.new("RGB", (1920, 1080), color="white")
-        # Add EXIF data with date
-        exif_dict = {
-            "0th": {},
-            "Exif": {
-                piexif.ExifIFD.DateTimeOriginal: datetime.now()
-                .strftime("%Y:%m:%d %H:%M:%S")
-                .encode("utf-8")
-            },
-        }
-        exif_bytes = piexif.dump(exif_dict)
-        img.save(img_path, quality=95, exif=exif_bytes)
+        img_path = os.path.join(sequence_dir, f"test_{i:03d}.jpg")
+        # Copy the session image (EXIF included) rather than encoding a new
+        # 1920x1080 JPEG for every frame
+        shutil.copyfile(white_image_1920x1080, img_path)
         sequence.append(img_path)
     return sequence
+
+
+@pytest.fixture
+def output_dir(temp_dir):
+    """Create an empty output directory for one test."""
+    path = os.path.join(temp_dir, "output")
+    os.makedirs(path)
+    return path
@@ -1,7 +1,8 @@
 import os
 import re
-import sys
+import shutil
 import pytest
+from .. import __main__ as cli
 from ..__main__ import main, parse_args, validate_args
 from ..utils import get_ffmpeg_path
 import subprocess
@@ -30,25 +31,29 @@ def get_video_dimensions(video_path):
     return int(m.group(1)), int(m.group(2))
 
 
-def test_basic_video_creation(temp_dir, image_sequence):
-    """Test basic video creation without any special options."""
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
+def run_cli(input_dir, output_dir, *options):
+    """Run the CLI on input_dir, writing to output_dir, with extra options."""
+    main(["--input", input_dir, "--output-dir", output_dir, *options])
 
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--fps",
-        "30",
-    ]
-    main()
 
-    output_files = os.listdir(output_dir)
+@pytest.mark.parametrize(
+    "flags,ext",
+    [
+        ([], ".mp4"),
+        (["--resolution", "1280x720"], ".mp4"),
+        (["--overlay-date"], ".mp4"),
+        (["--overlay-frame"], ".mp4"),
+        (["--hd-crop", "center", "--overlay-date", "--quality", "prores"], ".mov"),
+    ],
+)
+def test_pipeline(output_dir, image_sequence, flags, ext):
+    """Test a render with each overlay, a custom resolution and combined options."""
+    run_cli(os.path.dirname(image_sequence[0]), output_dir, "--fps", "30", *flags)
+
+    # Hidden files (the date cache) are not outputs
+    output_files = [f for f in os.listdir(output_dir) if not f.startswith(".")]
     assert len(output_files) == 1
-    assert output_files[0].endswith(".mp4")
+    assert output_files[0].endswith(ext)
 
 
 @pytest.mark.parametrize(
@@ -63,25 +68,10 @@ def test_basic_video_creation(temp_dir, image_sequence):
         ("--uhd-crop", "keep_bottom"),
     ],
 )
-def test_crop_options(temp_dir, image_sequence, crop_opt, value):
+def test_crop_options(output_dir, image_sequence, crop_opt, value):
     """Test all crop options."""
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
-
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--fps",
-        "30",
-    ]
-    if crop_opt == "--instagram-crop":
-        sys.argv.append(crop_opt)
-    else:
-        sys.argv.extend([crop_opt, value])
-    main()
+    crop_args = [crop_opt] if value is None else [crop_opt, value]
+    run_cli(os.path.dirname(image_sequence[0]), output_dir, "--fps", "30", *crop_args)
 
     output_files = os.listdir(output_dir)
     assert len(output_files) > 0
@@ -92,75 +82,22 @@ def test_crop_options(temp_dir, image_sequence, crop_opt, value):
     "quality,ext",
     [("default", ".mp4"), ("prores", ".mov"), ("proreshq", ".mov"), ("gif", ".gif")],
 )
-def test_quality_options(temp_dir, image_sequence, quality, ext):
+def test_quality_options(output_dir, image_sequence, quality, ext):
     """Test all quality options."""
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
-
-    sys.argv = [
-        "sisr",
-        "--input",
+    run_cli(
         os.path.dirname(image_sequence[0]),
-        "--output-dir",
         output_dir,
         "--fps",
         "30",
         "--quality",
         quality,
-    ]
-    main()
+    )
 
     output_files = os.listdir(output_dir)
     assert len(output_files) > 0
     assert any(f.endswith(ext) for f in output_files)
 
 
-@pytest.mark.parametrize("overlay_opt", ["--overlay-date", "--overlay-frame"])
-def test_overlay_options(temp_dir, image_sequence, overlay_opt):
-    """Test date and frame overlay options."""
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
-
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--fps",
-        "30",
-        overlay_opt,
-    ]
-    main()
-
-    output_files = os.listdir(output_dir)
-    assert len(output_files) > 0
-    assert any(f.endswith(".mp4") for f in output_files)
-
-
-def test_custom_resolution(temp_dir, image_sequence):
-    """Test custom resolution option."""
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
-
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--fps",
-        "30",
-        "--resolution",
-        "1280x720",
-    ]
-    main()
-
-    output_files = os.listdir(output_dir)
-    assert len(output_files) == 1
-    assert output_files[0].endswith(".mp4")
-
-
 @pytest.mark.parametrize(
     "invalid_opts",
     [
@@ -173,54 +110,48 @@ def test_custom_resolution(temp_dir, image_sequence):
 )
 def test_invalid_options(temp_dir, image_sequence, invalid_opts):
     """Test invalid option combinations."""
+    argv = ["--input", os.path.dirname(image_sequence[0]), "--output-dir", temp_dir]
     with pytest.raises((SystemExit, ValueError)):
-        sys.argv = [
-            "sisr",
-            "--input",
-            os.path.dirname(image_sequence[0]),
-            "--output-dir",
-            temp_dir,
-        ] + invalid_opts
-        main()
+        validate_args(parse_args(argv + invalid_opts))
+
+
+def test_date_overlay_frame_order(temp_dir, output_dir, image_sequence, monkeypatch):
+    """Test unpadded frame names render in numeric order with the date overlay."""
+    input_dir = os.path.join(temp_dir, "seq")
+    os.makedirs(input_dir)
+    for name in ["cover.jpg"] + [f"img_{i}.jpg" for i in range(1, 13)]:
+        shutil.copyfile(image_sequence[0], os.path.join(input_dir, name))
+    rendered = []
+    monkeypatch.setattr(
+        cli,
+        "create_video_with_overlay",
+        lambda image_date_files, **kwargs: rendered.extend(
+            os.path.basename(path) for path, _ in image_date_files
+        ),
+    )
+    run_cli(input_dir, output_dir, "--overlay-date")
+    # Images without a sequence number are rendered too, placed by name
+    assert rendered == ["cover.jpg"] + [f"img_{i}.jpg" for i in range(1, 13)]
 
 
-def test_empty_input_directory(temp_dir):
-    """Test behavior with empty input directory."""
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
+def test_jobs_name_clashing_directories(temp_dir, output_dir, image_sequence):
+    """Test folders sharing a name render to separate files with --jobs."""
+    for day in ("day1", "day2"):
+        cam = os.path.join(temp_dir, "in", day, "cam")
+        os.makedirs(cam)
+        for path in image_sequence:
+            shutil.copy(path, cam)
+    run_cli(os.path.join(temp_dir, "in"), output_dir, "--jobs", "2")
+    assert sorted(os.listdir(output_dir)) == ["day1_cam.mp4", "day2_cam.mp4"]
+
 
-    sys.argv = ["sisr", "--input", temp_dir, "--output-dir", output_dir, "--fps", "30"]
+def test_empty_input_directory(temp_dir, output_dir):
+    """Test behavior with empty input directory."""
     with pytest.raises(SystemExit) as exc_info:
-        main()
+        run_cli(temp_dir, output_dir, "--fps", "30")
     assert exc_info.value.code == 1
 
 
-def test_combined_options(temp_dir, image_sequence):
-    """Test multiple options combined."""
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
-
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--fps",
-        "30",
-        "--hd-crop",
-        "center",
-        "--overlay-date",
-        "--quality",
-        "prores",
-    ]
-    main()
-
-    output_files = os.listdir(output_dir)
-    assert len(output_files) > 0
-    assert any(f.endswith(".mov") for f in output_files)
-
-
 def test_different_fps_values(temp_dir, image_sequence):
     """Test different FPS values."""
     fps_values = [1, 15, 30, 60, 120]
@@ -229,16 +160,7 @@ def test_different_fps_values(temp_dir, image_sequence):
         output_dir = os.path.join(temp_dir, f"output_{fps}")
         os.makedirs(output_dir)
 
-        sys.argv = [
-            "sisr",
-            "--input",
-            os.path.dirname(image_sequence[0]),
-            "--output-dir",
-            output_dir,
-            "--fps",
-            str(fps),
-        ]
-        main()
+        run_cli(os.path.dirname(image_sequence[0]), output_dir, "--fps", str(fps))
 
         output_files = os.listdir(output_dir)
         assert len(output_files) == 1
@@ -250,164 +172,57 @@ def test_framerate_alias(temp_dir, image_sequence):
     output_dir = os.path.join(temp_dir, "output_framerate")
     os.makedirs(output_dir)
 
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--framerate",
-        "24",
-    ]
-    main()
+    run_cli(os.path.dirname(image_sequence[0]), output_dir, "--framerate", "24")
 
     output_files = os.listdir(output_dir)
     assert len(output_files) == 1
     assert output_files[0].endswith(".mp4")
 
 
-def test_output_filename_formatting(temp_dir, image_sequence):
+def test_output_filename_formatting(output_dir, image_sequence):
     """Test output filename formatting with different options."""
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
-
     # Test with date overlay
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--fps",
-        "30",
-        "--overlay-date",
-    ]
-    main()
-
-    output_files = [f for f in os.listdir(output_dir) if f.endswith(".mp4")]
-    assert len(output_files) == 1
-
-    # Test with frame overlay
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--fps",
-        "30",
-        "--overlay-frame",
-    ]
-    main()
-
-    output_files = [f for f in os.listdir(output_dir) if f.endswith(".mp4")]
-    assert len(output_files) == 2
-
-
-def test_max_width_scaling(temp_dir, image_sequence):
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--fps",
-        "30",
-        "--max-width",
-        "1280",
-    ]
-    main()
-    output_files = [f for f in os.listdir(output_dir) if f.endswith(".mp4")]
-    assert len(output_files) == 1
-    assert re.search(r"_1280x720\.mp4$", output_files[0])
-    out_path = os.path.join(output_dir, output_files[0])
-    w, h = get_video_dimensions(out_path)
-    assert w == 1280
-    assert h % 2 == 0
-
+    run_cli(
+        os.path.dirname(image_sequence[0]), output_dir, "--fps", "30", "--overlay-date"
+    )
 
-def test_max_height_scaling(temp_dir, image_sequence):
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--fps",
-        "30",
-        "--max-height",
-        "720",
-    ]
-    main()
-    output_files = [f for f in os.listdir(output_dir) if f.endswith(".mp4")]
-    assert len(output_files) == 1
-    assert re.search(r"_1280x720\.mp4$", output_files[0])
-    out_path = os.path.join(output_dir, output_files[0])
-    w, h = get_video_dimensions(out_path)
-    assert h == 720
-    assert w % 2 == 0
+    date_files = {f for f in os.listdir(output_dir) if f.endswith(".mp4")}
+    assert len(date_files) == 1
+    assert "_date" in next(iter(date_files))
 
+    # Test with frame overlay: the second render adds exactly one new file
+    run_cli(
+        os.path.dirname(image_sequence[0]), output_dir, "--fps", "30", "--overlay-frame"
+    )
 
-def test_max_width_and_height_scaling(temp_dir, image_sequence):
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--fps",
-        "30",
-        "--max-width",
-        "1000",
-        "--max-height",
-        "500",
-    ]
-    main()
-    output_files = [f for f in os.listdir(output_dir) if f.endswith(".mp4")]
-    assert len(output_files) == 1
-    assert re.search(r"_888x500\.mp4$", output_files[0])
-    out_path = os.path.join(output_dir, output_files[0])
-    w, h = get_video_dimensions(out_path)
-    assert w <= 1000 and h <= 500
-    assert w % 2 == 0 and h % 2 == 0
+    output_files = {f for f in os.listdir(output_dir) if f.endswith(".mp4")}
+    new_files = output_files - date_files
+    assert len(new_files) == 1
+    assert "_frame" in next(iter(new_files))
 
 
-def test_scaling_with_overlay(temp_dir, image_sequence):
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
-    sys.argv = [
-        "sisr",
-        "--input",
-        os.path.dirname(image_sequence[0]),
-        "--output-dir",
-        output_dir,
-        "--fps",
-        "30",
-        "--max-width",
-        "640",
-        "--overlay-date",
-    ]
-    main()
+@pytest.mark.parametrize(
+    "scale_opts,suffix,size",
+    [
+        (["--max-width", "1280"], "", (1280, 720)),
+        (["--max-height", "720"], "", (1280, 720)),
+        (["--max-width", "1000", "--max-height", "500"], "", (888, 500)),
+        (["--max-width", "640", "--overlay-date"], "_date", (640, 360)),
+    ],
+)
+def test_max_size_scaling(output_dir, image_sequence, scale_opts, suffix, size):
+    """Test proportional scaling to max width/height (16:9 source)."""
+    run_cli(os.path.dirname(image_sequence[0]), output_dir, "--fps", "30", *scale_opts)
     output_files = [f for f in os.listdir(output_dir) if f.endswith(".mp4")]
     assert len(output_files) == 1
-    assert re.search(r"_date_640x360\.mp4$", output_files[0])
+    assert output_files[0].endswith(f"{suffix}_{size[0]}x{size[1]}.mp4")
+    # Scaled sizes stay even for the encoder
     out_path = os.path.join(output_dir, output_files[0])
-    w, h = get_video_dimensions(out_path)
-    assert w == 640
-    assert h % 2 == 0
+    assert get_video_dimensions(out_path) == size
 
 
-def test_scaling_not_allowed_with_crop(temp_dir, image_sequence):
-    output_dir = os.path.join(temp_dir, "output")
-    os.makedirs(output_dir)
-    sys.argv = [
-        "sisr",
+def test_scaling_not_allowed_with_crop(output_dir, image_sequence):
+    argv = [
         "--input",
         os.path.dirname(image_sequence[0]),
         "--output-dir",
@@ -420,4 +235,4 @@ def test_scaling_not_allowed_with_crop(temp_dir, image_sequence):
         "center",
     ]
     with pytest.raises((SystemExit, ValueError)):
-        main()
+        validate_args(parse_args(argv))
@@ -0,0 +1,209 @@
+import json
+import os
+import shutil
+import subprocess
+from PIL import ExifTags, Image
+from .. import core
+from ..core import (
+    _crop_box,
+    _exif_orientation,
+    _fast_datetime,
+    _output_names,
+    _read_image_size,
+    create_date_files,
+    create_video_with_overlay,
+    extract_date_time,
+)
+from ..utils import get_ffmpeg_path
+
+
+def _exif_bytes(date_str):
+    exif = Image.Exif()
+    exif.get_ifd(ExifTags.IFD.Exif)[ExifTags.Base.DateTimeOriginal] = date_str
+    return exif.tobytes()
+
+
+def test_fast_datetime_jpeg(temp_dir):
+    path = os.path.join(temp_dir, "img_0001.jpg")
+    Image.new("RGB", (64, 48), "white").save(
+        path, exif=_exif_bytes("2024:01:02 03:04:05")
+    )
+    assert _fast_datetime(path) == "2024:01:02 03:04:05"
+    assert extract_date_time(path) == "Tuesday, January 02, 2024 03:04AM"
+
+
+def test_fast_datetime_png(temp_dir):
+    path = os.path.join(temp_dir, "img_0001.png")
+    Image.new("RGB", (64, 48), "white").save(
+        path, exif=_exif_bytes("2023:12:31 23:59:58")
+    )
+    assert _fast_datetime(path) == "2023:12:31 23:59:58"
+
+
+def test_fast_datetime_falls_back_to_datetime(temp_dir):
+    path = os.path.join(temp_dir, "img_0001.jpg")
+    exif = Image.Exif()
+    exif[ExifTags.Base.DateTime] = "2022:06:07 08:09:10"
+    Image.new("RGB", (64, 48), "white").save(path, exif=exif)
+    assert _fast_datetime(path) == "2022:06:07 08:09:10"
+
+
+def test_fast_datetime_without_exif(temp_dir):
+    path = os.path.join(temp_dir, "img_0001.jpg")
+    Image.new("RGB", (64, 48), "white").save(path)
+    assert _fast_datetime(path) is None
+    bmp = os.path.join(temp_dir, "img_0002.bmp")
+    Image.new("RGB", (64, 48), "white").save(bmp)
+    assert _fast_datetime(bmp) is None
+
+
+def test_read_image_size(temp_dir):
+    jpeg = os.path.join(temp_dir, "img_0001.jpg")
+    Image.new("RGB", (64, 48), "white").save(
+        jpeg, exif=_exif_bytes("2024:01:02 03:04:05")
+    )
+    assert _read_image_size(jpeg) == (64, 48)
+    progressive = os.path.join(temp_dir, "img_0002.jpg")
+    Image.new("RGB", (33, 17), "white").save(progressive, progressive=True)
+    assert _read_image_size(progressive) == (33, 17)
+    png = os.path.join(temp_dir, "img_0003.png")
+    Image.new("RGB", (20, 10), "white").save(png)
+    assert _read_image_size(png) == (20, 10)
+    bmp = os.path.join(temp_dir, "img_0004.bmp")
+    Image.new("RGB", (20, 10), "white").save(bmp)
+    assert _read_image_size(bmp) is None
+
+
+def test_create_date_files_process_pool(temp_dir, image_sequence, monkeypatch):
+    image_dir = os.path.dirname(image_sequence[0])
+    serial = create_date_files(image_dir, os.path.join(temp_dir, "serial"))
+    monkeypatch.setattr(core, "_PARALLEL_MIN_IMAGES", 0)
+    assert create_date_files(image_dir, os.path.join(temp_dir, "pool")) == serial
+    assert [path for path, _ in serial] == sorted(image_sequence)
+
+
+def test_extract_date_time_from_filename(temp_dir):
+    path = os.path.join(temp_dir, "IMG_20240101_120000_0001.jpg")
+    Image.new("RGB", (64, 48), "white").save(
+        path, exif=_exif_bytes("2023:05:06 07:08:09")
+    )
+    assert extract_date_time(path) == "Monday, January 01, 2024 12:00PM"
+    assert extract_date_time(path, "exif") == "Saturday, May 06, 2023 07:08AM"
+    plain = os.path.join(temp_dir, "img_0001.jpg")
+    Image.new("RGB", (64, 48), "white").save(
+        plain, exif=_exif_bytes("2023:05:06 07:08:09")
+    )
+    assert extract_date_time(plain) == "Saturday, May 06, 2023 07:08AM"
+
+
+def test_create_date_files_reuses_cached_dates(temp_dir, image_sequence, monkeypatch):
+    image_dir = os.path.dirname(image_sequence[0])
+    first = create_date_files(image_dir, temp_dir)
+    assert os.path.isfile(os.path.join(temp_dir, ".date_cache.json"))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("date re-read for an unchanged image")
+
+    monkeypatch.setattr(core, "_extract_and_format", fail)
+    assert create_date_files(image_dir, temp_dir) == first
+
+
+def test_date_cache_merges_and_prunes(temp_dir, image_sequence, monkeypatch):
+    output = os.path.join(temp_dir, "output")
+    dirs = []
+    for name in ("day1", "day2"):
+        image_dir = os.path.join(temp_dir, name)
+        os.makedirs(image_dir)
+        for path in image_sequence:
+            shutil.copy(path, image_dir)
+        dirs.append(image_dir)
+    create_date_files(dirs[0], output)
+
+    # day2 loads the cache as if before day1 saved; its save must merge
+    load = core._load_date_cache
+    calls = []
+
+    def stale_load(cache_path):
+        calls.append(cache_path)
+        return {} if len(calls) == 1 else load(cache_path)
+
+    monkeypatch.setattr(core, "_load_date_cache", stale_load)
+    create_date_files(dirs[1], output)
+    monkeypatch.undo()
+
+    def cached():
+        with open(os.path.join(output, ".date_cache.json"), encoding="utf-8") as f:
+            return sorted(os.path.relpath(key, temp_dir) for key in json.load(f))
+
+    names = sorted(os.path.basename(path) for path in image_sequence)
+    day2 = [os.path.join("day2", name) for name in names]
+    assert cached() == [os.path.join("day1", name) for name in names] + day2
+
+    # Entries for removed images are dropped
+    os.remove(os.path.join(dirs[0], names[0]))
+    create_date_files(dirs[0], output)
+    assert cached() == [os.path.join("day1", name) for name in names[1:]] + day2
+
+
+def test_crop_box():
+    # Wider than 16:9: sides trimmed, full height kept
+    assert _crop_box(4000, 2000, "hd_keep_top") == (3554, 2000, 223, 0)
+    # Taller than 16:9: rows trimmed according to the variant
+    assert _crop_box(4000, 3000, "uhd_center") == (4000, 2250, 0, 375)
+    assert _crop_box(4000, 3000, "hd_keep_top") == (4000, 2250, 0, 0)
+    assert _crop_box(4000, 3000, "hd_keep_bottom") == (4000, 2250, 0, 750)
+    assert _crop_box(640, 360, "instagram") == (202, 360, 219, 0)
+
+
+def test_exif_orientation(temp_dir):
+    rotated = os.path.join(temp_dir, "img_0001.jpg")
+    exif = Image.Exif()
+    exif[ExifTags.Base.Orientation] = 6
+    Image.new("RGB", (64, 48), "white").save(rotated, exif=exif)
+    assert _exif_orientation(rotated) == 6
+    plain = os.path.join(temp_dir, "img_0002.jpg")
+    Image.new("RGB", (64, 48), "white").save(plain)
+    assert _exif_orientation(plain) == 1
+
+
+def test_date_overlay_keeps_every_frame(temp_dir):
+    # Distinct frames, so a dropped or repeated one shows up as a duplicate
+    paths = []
+    for i in range(40):
+        path = os.path.join(temp_dir, f"img_{i:04d}.jpg")
+        img = Image.new("RGB", (64, 48), "black")
+        img.paste((255, 255, 255), (0, 0, i + 1, 24))
+        img.save(path)
+        paths.append(path)
+    output = create_video_with_overlay(
+        paths,
+        os.path.join(temp_dir, "out", "seq.mp4"),
+        fps=60,
+        overlay_type="date",
+        dates=[None] * len(paths),
+    )
+    r = subprocess.run(
+        [get_ffmpeg_path(), "-v", "error", "-i", output, "-f", "framemd5", "-"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    hashes = [
+        line.rsplit(",", 1)[1].strip()
+        for line in r.stdout.splitlines()
+        if not line.startswith("#")
+    ]
+    assert len(hashes) == len(set(hashes)) == len(paths)
+
+
+def test_output_names():
+    root = os.path.join("in")
+    dirs = [
+        os.path.join(root, "day1", "cam"),
+        os.path.join(root, "day2", "cam"),
+        os.path.join(root, "other"),
+        os.path.join(root, "day1_Cam"),
+    ]
+    assert _output_names(root, dirs) == ["day1_cam", "day2_cam", "other", "day1_Cam_2"]
+    # The input folder itself keeps its name
+    assert _output_names(root, [root, os.path.join(root, "in")]) == ["in", "in_2"]
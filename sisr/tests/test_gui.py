@@ -0,0 +1,16 @@
+import pytest
+
+pytest.importorskip("tkinter")
+
+from ..gui import _split_frame_name  # noqa: E402
+
+
+def test_split_frame_name():
+    assert _split_frame_name("img_0001.jpg") == ("img_", "0001", ".jpg")
+    assert _split_frame_name("0042.PNG") == ("", "0042", ".PNG")
+    # Only the digits directly before the last extension count
+    assert _split_frame_name("day2.shot10.jpg") == ("day2.shot", "10", ".jpg")
+    assert _split_frame_name("img_0001a.jpg") is None
+    assert _split_frame_name("cover.jpg") is None
+    assert _split_frame_name("0001") is None
+    assert _split_frame_name("0001.") is None
@@ -23,3 +23,22 @@ def test_save_and_load_prefs(tmp_path, monkeypatch):
     preferences.save_prefs(prefs2)
     loaded2 = preferences.load_prefs()
     assert loaded2 == prefs2
+
+
+def test_prefs_cache_skips_unchanged_saves(tmp_path, monkeypatch):
+    test_prefs_path = tmp_path / "prefs.json"
+    monkeypatch.setattr(preferences, "PREFS_PATH", str(test_prefs_path))
+
+    prefs = {"input_dir": "/tmp/input", "fps": 30}
+    preferences.save_prefs(prefs)
+    # Mark the file so a rewrite would be visible
+    os.utime(test_prefs_path, ns=(0, 0))
+    preferences._remember(str(test_prefs_path), prefs)
+
+    preferences.save_prefs(dict(prefs))
+    assert os.stat(test_prefs_path).st_mtime_ns == 0
+
+    # A change made outside SISR is picked up rather than served from cache
+    with open(test_prefs_path, "w") as f:
+        json.dump({"fps": 24}, f)
+    assert preferences.load_prefs() == {"fps": 24}
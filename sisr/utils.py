@@ -1,6 +1,9 @@
 import os
+import platform
+import subprocess
 import sys
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 
 def resource_path(*parts: str) -> str:
@@ -27,6 +30,27 @@ def _imageio_ffmpeg_exe() -> tuple[Optional[str], Optional[BaseException]]:
         return None, exc
 
 
+@lru_cache(maxsize=1)
+def _bundled_ffmpeg() -> tuple[Optional[str], Optional[BaseException]]:
+    """Locate the bundled ffmpeg once per process, as an absolute path.
+
+    The environment overrides are checked by ``get_ffmpeg_path`` on every
+    call; only this filesystem/package lookup is cached.
+    """
+    if getattr(sys, "frozen", False):
+        base_path = getattr(sys, "_MEIPASS", os.path.dirname(sys.executable))
+        for candidate in (
+            os.path.join(base_path, "ffmpeg"),
+            os.path.join(os.path.dirname(sys.executable), "ffmpeg"),
+        ):
+            if os.path.exists(candidate):
+                return os.path.abspath(candidate), None
+    bundled, load_err = _imageio_ffmpeg_exe()
+    if bundled:
+        return os.path.abspath(bundled), None
+    return None, load_err
+
+
 def get_ffmpeg_path() -> str:
     """Return the path to the bundled ffmpeg binary.
 
@@ -44,15 +68,7 @@ def get_ffmpeg_path() -> str:
     override = os.environ.get("SISR_FFMPEG") or os.environ.get("FFMPEG_BINARY")
     if override:
         return override
-    if getattr(sys, "frozen", False):
-        base_path = getattr(sys, "_MEIPASS", os.path.dirname(sys.executable))
-        for candidate in (
-            os.path.join(base_path, "ffmpeg"),
-            os.path.join(os.path.dirname(sys.executable), "ffmpeg"),
-        ):
-            if os.path.exists(candidate):
-                return candidate
-    bundled, load_err = _imageio_ffmpeg_exe()
+    bundled, load_err = _bundled_ffmpeg()
     if bundled:
         return bundled
     detail = f"\nUnderlying error: {load_err!r}" if load_err else ""
@@ -64,3 +80,124 @@ def get_ffmpeg_path() -> str:
         "or reinstall this package from its requirements."
         f"{detail}"
     )
+
+
+def _hw_encoder_candidates() -> Tuple[str, ...]:
+    """Hardware H.264 encoders worth probing on this platform, best first."""
+    if platform.system() == "Darwin":
+        return ("h264_videotoolbox",)
+    return ("h264_nvenc", "h264_qsv")
+
+
+def _encoder_works(ffmpeg: str, encoder: str) -> bool:
+    """Encode one tiny synthetic frame to confirm the encoder has usable hardware.
+
+    Static FFmpeg builds list NVENC/QSV even on machines without the GPU, so
+    presence in ``-encoders`` alone is not enough.
+    """
+    try:
+        r = subprocess.run(
+            [
+                ffmpeg,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                "color=c=black:s=256x256:d=0.1",
+                "-frames:v",
+                "1",
+                "-c:v",
+                encoder,
+                "-f",
+                "null",
+                "-",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=20,
+            check=False,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return r.returncode == 0
+
+
+@lru_cache(maxsize=1)
+def detect_hw_encoder() -> str:
+    """Return the best working hardware H.264 encoder, or ``libx264``.
+
+    Runs ``ffmpeg -encoders`` once per process and probes the platform's
+    candidates (``h264_videotoolbox`` on macOS, ``h264_nvenc`` then
+    ``h264_qsv`` elsewhere). The result is cached.
+    """
+    try:
+        ffmpeg = get_ffmpeg_path()
+        listing = subprocess.run(
+            [ffmpeg, "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=20,
+            check=False,
+        ).stdout
+    except (OSError, RuntimeError, subprocess.SubprocessError):
+        return "libx264"
+    available = {
+        line.split()[1] for line in listing.splitlines() if len(line.split()) > 1
+    }
+    for encoder in _hw_encoder_candidates():
+        if encoder in available and _encoder_works(ffmpeg, encoder):
+            return encoder
+    return "libx264"
+
+
+# Output options for each hardware H.264 encoder, tuned to roughly match
+# libx264 at CRF 18
+_HW_ENCODER_ARGS = {
+    "h264_nvenc": (
+        "-pix_fmt",
+        "yuv420p",
+        "-profile:v",
+        "high",
+        "-rc",
+        "vbr",
+        "-cq",
+        "19",
+        "-b:v",
+        "0",
+        "-preset",
+        "p5",
+    ),
+    "h264_videotoolbox": (
+        "-pix_fmt",
+        "yuv420p",
+        "-profile:v",
+        "high",
+        "-q:v",
+        "55",
+        "-allow_sw",
+        "1",
+    ),
+    "h264_qsv": (
+        "-pix_fmt",
+        "nv12",
+        "-profile:v",
+        "high",
+        "-global_quality",
+        "19",
+    ),
+}
+
+
+def hw_encoder_args(encoder: str) -> List[str]:
+    """FFmpeg output options (``-c:v`` included) for a hardware H.264 encoder.
+
+    Args:
+        encoder: Encoder name returned by ``detect_hw_encoder`` other than
+            ``libx264``
+
+    Raises:
+        KeyError: If ``encoder`` is not a known hardware encoder
+    """
+    return ["-c:v", encoder, *_HW_ENCODER_ARGS[encoder]]